@@ -7,6 +7,8 @@
 #
 
 import time
+import math
+from enum import IntEnum
 
 import numpy as np
 from covstack import CovStack
@@ -17,12 +19,732 @@ from numpy import polynomial
 # for replicating instances
 import copy
 
-# for debug plotting
-from matplotlib.pylab import plt
-plt.ion()
+# for debug plotting. matplotlib is imported only when a plot is
+# actually made (see _getplt()), so that the transformation classes
+# don't pay its import cost.
 
-# for occasional fitting
-from weightedDeltas import NormalEqs, Stack2x2
+# for occasional fitting. weightedDeltas brings in matplotlib (and
+# more) on import, so it too is imported where it's used, in
+# fit6term().
+
+# Powers and selected indices for Patternmatrix, keyed by degree. These
+# depend only on the degree, so are computed once per degree.
+_POWERS_CACHE = {}
+
+# Contraction paths for the einsum evaluations in Poly, keyed by the
+# subscripts and operand shapes. These are called with the same
+# shapes over and over, so we plan each contraction once rather than
+# on every call.
+_EINSUM_PATHS = {}
+_EINSUM_PATHS_MAX = 64
+
+def _einsumpath(subscripts='', *operands):
+
+    """Returns a contraction path for np.einsum(subscripts, *operands),
+planning it only the first time these subscripts are used with these
+operand shapes"""
+
+    key = (subscripts,) + tuple(np.shape(op) for op in operands)
+    if key not in _EINSUM_PATHS:
+        if len(_EINSUM_PATHS) >= _EINSUM_PATHS_MAX:
+            _EINSUM_PATHS.clear()
+        _EINSUM_PATHS[key] = np.einsum_path(subscripts, *operands, \
+                                            optimize='greedy')[0]
+
+    return _EINSUM_PATHS[key]
+
+def _getplt():
+
+    """Imports and returns pyplot, in interactive mode, for the plotting
+methods"""
+
+    import matplotlib.pyplot as plt
+    plt.ion()
+
+    return plt
+
+class PolyKind(IntEnum):
+
+    """Integer labels for the supported polynomial kinds, used to index
+the method tables below"""
+
+    POLY = 0
+    CHEB = 1
+    LEG = 2
+    HERM = 3
+    HERME = 4
+
+# Names of the supported kinds (in PolyKind order) and the lookup from
+# name to PolyKind
+_KINDNAMES = ('Polynomial', 'Chebyshev', 'Legendre', 'Hermite', 'HermiteE')
+_KINDS = {name:PolyKind(i) for i, name in enumerate(_KINDNAMES)}
+
+# Method tables indexed by PolyKind. All use unlimited domain or [-1.,
+# 1.] domain.
+_VANDER = (polynomial.polynomial.polyvander, \
+           polynomial.chebyshev.chebvander, \
+           polynomial.legendre.legvander, \
+           polynomial.hermite.hermvander, \
+           polynomial.hermite_e.hermevander)
+
+_VAL2D = (polynomial.polynomial.polyval2d, \
+          polynomial.chebyshev.chebval2d, \
+          polynomial.legendre.legval2d, \
+          polynomial.hermite.hermval2d, \
+          polynomial.hermite_e.hermeval2d)
+
+_DER = (polynomial.polynomial.polyder, \
+        polynomial.chebyshev.chebder, \
+        polynomial.legendre.legder, \
+        polynomial.hermite.hermder, \
+        polynomial.hermite_e.hermeder)
+
+def degfromcoeffs(m=1):
+
+    """Returns the degree of the 2D polynomial given the number of
+coefficients m. Non-integer output means m does not correspond to a
+complete polynomial."""
+
+    return (-3. + np.sqrt(9.0 + 8.*(m-1.) ))/2.
+
+def _ingestarray(a=np.array([]), copy=True, dtype=None):
+
+    """Returns a as a C-contiguous array (of type dtype, if given). With
+copy=False, a is only copied if it isn't one already."""
+
+    if copy:
+        return np.array(a, dtype=dtype, copy=True, order='C')
+
+    # (unlike np.ascontiguousarray, this leaves scalars 0-d)
+    return np.asarray(a, dtype=dtype, order='C')
+
+def _copylimit(lim=None):
+
+    """Returns a domain limit as a plain float, or None if unset. Limits
+that aren't scalars are copied as arrays."""
+
+    if lim is None:
+        return None
+
+    # (a 0-d array wrapping None, e.g. from an earlier np.copy(None),
+    # counts as unset)
+    if np.size(lim) == 1:
+        val = np.asarray(lim).item()
+        return None if val is None else float(val)
+
+    return np.copy(lim)
+
+def _readonlyview(a=np.array([]) ):
+
+    """Returns a read-only view of the input array. Used in place of
+defensive copies for inputs we only read: the view costs no copy, and
+flagging the view (not the input) leaves the caller's array
+writeable."""
+
+    view = np.asarray(a).view()
+    view.setflags(write=False)
+
+    return view
+
+def _polyhorner(t=np.array([]), c=np.array([]) ):
+
+    """Returns the sum over k of c[k] t**k by Horner's rule, where each
+c[k] broadcasts against t"""
+
+    # (the same recurrence numpy's polyval uses. A constant still
+    # takes the shape of t.)
+    if len(c) == 1:
+        return c[0] + 0.*t
+
+    r = c[-1]*t + c[-2]
+    for k in range(len(c)-3, -1, -1):
+        r = r*t + c[k]
+
+    return r
+
+def _polyval2d_fast(x=np.array([]), y=np.array([]), c=np.array([]) ):
+
+    """Evaluates the ordinary 2D polynomial with coefficients c at x, y,
+as numpy's polyval2d does but without going through
+numpy.polynomial"""
+
+    # As _chebval2d_fast: Horner along x for all the y-degrees at
+    # once, then along y. This needs no power tables (and no
+    # exponentiation), just one multiply-add per coefficient row.
+    # (work in the inputs' floating dtype, so float32 stays float32)
+    x = np.asarray(x)
+    y = np.asarray(y)
+    c = np.asarray(c)
+    dt = np.result_type(x, y, c, 1.0)
+    x = x.astype(dt, copy=False)
+    y = y.astype(dt, copy=False)
+    c = c.astype(dt, copy=False)
+
+    cx = c.reshape(c.shape + (1,)*x.ndim)
+
+    return _polyhorner(y, _polyhorner(x, cx))
+
+def _chebclenshaw(t=np.array([]), c=np.array([]) ):
+
+    """Returns the sum over k of c[k] T_k(t) by Clenshaw's recurrence,
+where each c[k] broadcasts against t"""
+
+    # (the same recurrence numpy's chebval uses)
+    if len(c) == 1:
+        c0 = c[0]
+        c1 = 0.
+    elif len(c) == 2:
+        c0 = c[0]
+        c1 = c[1]
+    else:
+        t2 = 2.*t
+        c0 = c[-2]
+        c1 = c[-1]
+        for i in range(3, len(c) + 1):
+            tmp = c0
+            c0 = c[-i] - c1
+            c1 = tmp + c1*t2
+
+    return c0 + c1*t
+
+def _chebval2d_fast(x=np.array([]), y=np.array([]), c=np.array([]) ):
+
+    """Evaluates the 2D Chebyshev series with coefficients c at x, y, as
+numpy's chebval2d does but without going through numpy.polynomial"""
+
+    # Clenshaw along x for all the y-degrees at once (giving [ny,
+    # ...]), then along y. No basis terms are formed explicitly.
+    # (as _polyval2d_fast, in the inputs' floating dtype)
+    x = np.asarray(x)
+    y = np.asarray(y)
+    c = np.asarray(c)
+    dt = np.result_type(x, y, c, 1.0)
+    x = x.astype(dt, copy=False)
+    y = y.astype(dt, copy=False)
+    c = c.astype(dt, copy=False)
+    
+    cx = c.reshape(c.shape + (1,)*x.ndim)
+
+    return _chebclenshaw(y, _chebclenshaw(x, cx))
+
+def _empty22(shp=(), dtype=np.float64):
+
+    """Returns an uninitialized [..., 2, 2] array (with leading shape shp)
+stored component by component, so that each [..., i, j] slice is
+contiguous"""
+
+    # The 2x2 kernels below work one component at a time on arrays
+    # of length N. With the components stored [2,2,N] and presented
+    # as [N,2,2], those slices are contiguous rather than strided.
+    buf = np.empty((2,2) + tuple(shp), dtype=dtype)
+
+    return np.moveaxis(buf, (0,1), (-2,-1))
+
+def _empty2(shp=(), dtype=np.float64):
+
+    """Returns an uninitialized [..., 2] array (with leading shape shp)
+stored component by component, so that each [..., i] slice is
+contiguous"""
+
+    # As _empty22, for positions
+    buf = np.empty((2,) + tuple(shp), dtype=dtype)
+
+    return np.moveaxis(buf, 0, -1)
+
+def _pack_xy(x=np.array([]), y=np.array([]), out=None):
+
+    """Packs the length-N coordinates x, y into an [N,2] array,
+written into out if that is supplied (and is the right shape)"""
+
+    # One copy per component, rather than vstack's copy followed by a
+    # transposed view
+    shp = np.shape(x)
+    if out is None or out.shape != shp + (2,):
+        out = _empty2(shp, dtype=np.result_type(x, y))
+    out[...,0] = x
+    out[...,1] = y
+
+    return out
+
+def _reuse22(buf=None, shp=(), dtype=np.float64):
+
+    """Returns buf if it is a [..., 2, 2] array of type dtype with leading
+shape shp, otherwise a new one (from _empty22). Used to keep
+per-instance output buffers across repeated propagations on the same
+number of points."""
+
+    if buf is not None and buf.shape[:-2] == tuple(shp) \
+       and buf.dtype == dtype:
+        return buf
+
+    return _empty22(shp, dtype=dtype)
+
+def _zeros22(shp=(), dtype=np.float64):
+
+    """Returns a zeroed [..., 2, 2] array (with leading shape shp), laid
+out as by _empty22"""
+
+    out = _empty22(shp, dtype=dtype)
+    out[...] = 0.
+
+    return out
+
+def _pack22(C=np.array([]) ):
+
+    """Returns the [..., 2, 2] array C stored component by component (as
+from _empty22), copying only if it isn't stored that way already"""
+
+    C = np.asarray(C)
+    if C.ndim < 3:
+        return C
+
+    if np.moveaxis(C, (-2,-1), (0,1)).flags.c_contiguous:
+        return C
+
+    return _copy22(C)
+
+def _packedcovs(C=np.array([]) ):
+
+    """Returns the [..., 2, 2] covariances C stored component by
+component (see _pack22) for the propagation kernel, or None if they are
+all zero (and so propagate to zero)"""
+
+    # (Done on every call, as the covariances may be changed in
+    # place. Both steps are O(N).)
+    if not np.any(C):
+        return None
+
+    return _pack22(C)
+
+def _copy22(C=np.array([]), dtype=None):
+
+    """Returns a copy of the [..., 2, 2] array C (as type dtype, if
+given) laid out as by _empty22"""
+
+    C = np.asarray(C)
+    if C.ndim < 3:
+        return np.array(C, dtype=dtype)
+
+    out = _empty22(C.shape[:-2], dtype=C.dtype if dtype is None else dtype)
+    np.copyto(out, C)
+
+    return out
+
+def _outok(out=None, *inputs):
+
+    """Returns out unless it overlaps with any of the inputs (in which
+case writing into it would clobber them), in which case returns None"""
+
+    if out is None:
+        return None
+    
+    for arr in inputs:
+        if np.may_share_memory(out, arr):
+            return None
+
+    return out
+
+def _mul22(A=np.array([]), B=np.array([]), out=None):
+
+    """Returns the product A.B for stacks of 2x2 matrices A, B (e.g.
+[N,2,2]), written out element by element. If supplied, the result is
+written into out."""
+
+    # 8 multiplies and 4 adds per plane. As with _propcov_22, either
+    # input can be a single 2x2.
+    a00, a01 = A[...,0,0], A[...,0,1]
+    a10, a11 = A[...,1,0], A[...,1,1]
+    b00, b01 = B[...,0,0], B[...,0,1]
+    b10, b11 = B[...,1,0], B[...,1,1]
+
+    shp = np.broadcast_shapes(np.shape(a00), np.shape(b00))
+    dtype = np.result_type(A, B)
+    out = _outok(out, A, B)
+    if out is None:
+        out = _empty22(shp, dtype=dtype)
+
+    tmp = np.empty(shp, dtype=dtype)
+    np.multiply(a01, b10, out=tmp)
+    np.multiply(a00, b00, out=out[...,0,0])
+    out[...,0,0] += tmp
+    np.multiply(a01, b11, out=tmp)
+    np.multiply(a00, b01, out=out[...,0,1])
+    out[...,0,1] += tmp
+    np.multiply(a11, b10, out=tmp)
+    np.multiply(a10, b00, out=out[...,1,0])
+    out[...,1,0] += tmp
+    np.multiply(a11, b11, out=tmp)
+    np.multiply(a10, b01, out=out[...,1,1])
+    out[...,1,1] += tmp
+
+    return out
+
+def _det22(J=np.array([]) ):
+
+    """Returns the determinants of a stack of 2x2 matrices J (e.g.
+[N,2,2]), written out"""
+
+    det = J[...,0,0] * J[...,1,1]
+    det -= J[...,0,1] * J[...,1,0]
+
+    return det
+
+def _adj22(J=np.array([]) ):
+
+    """Returns the adjugates of a stack of 2x2 matrices J (e.g. [N,2,2]),
+i.e. their inverses multiplied by their determinants"""
+
+    out = _empty22(np.shape(J)[:-2], dtype=np.result_type(J, 1.0))
+    out[...,0,0] = J[...,1,1]
+    np.negative(J[...,0,1], out=out[...,0,1])
+    np.negative(J[...,1,0], out=out[...,1,0])
+    out[...,1,1] = J[...,0,0]
+
+    return out
+
+def _inv22(J=np.array([]) ):
+
+    """Returns the inverses of a stack of 2x2 matrices J (e.g. [N,2,2]),
+from the adjugate, and their determinants"""
+
+    # For 2x2 the closed form beats the batched LAPACK call, and the
+    # determinant comes along for free
+    a, b = J[...,0,0], J[...,0,1]
+    c, d = J[...,1,0], J[...,1,1]
+    det = _det22(J)
+
+    out = _empty22(np.shape(det), dtype=np.result_type(J, 1.0))
+    np.divide(d, det, out=out[...,0,0])
+    np.divide(b, det, out=out[...,0,1])
+    np.negative(out[...,0,1], out=out[...,0,1])
+    np.divide(c, det, out=out[...,1,0])
+    np.negative(out[...,1,0], out=out[...,1,0])
+    np.divide(a, det, out=out[...,1,1])
+
+    return out, det
+
+def _mul22vec(J=np.array([]), dx=0., dy=0., out=None):
+
+    """Returns J.[dx, dy] for a stack of 2x2 matrices J (e.g. [N,2,2])
+and a single 2-vector, written out as two multiply-adds. The result
+is [..., 2]. If supplied, the result is written into out."""
+
+    # For a constant 2-vector matmul's dispatch costs more than the
+    # arithmetic.
+    j00, j01 = J[...,0,0], J[...,0,1]
+    j10, j11 = J[...,1,0], J[...,1,1]
+
+    shp = np.shape(j00)
+    dtype = np.result_type(J, dx, dy)
+    out = _outok(out, J)
+    if out is None:
+        out = np.empty(shp + (2,), dtype=dtype)
+    tmp = np.empty(shp, dtype=dtype)
+
+    np.multiply(j00, dx, out=out[...,0])
+    np.multiply(j01, dy, out=tmp)
+    out[...,0] += tmp
+    np.multiply(j10, dx, out=out[...,1])
+    np.multiply(j11, dy, out=tmp)
+    out[...,1] += tmp
+
+    return out
+
+def _propcov_22(J=np.array([]), C=np.array([]), out=None, work=None):
+
+    """Returns J.C.J^T for stacks of 2x2 jacobians J and symmetric 2x2
+covariances C (e.g. [N,2,2]), written out element by element. If
+supplied, the result is written into out, and the intermediates into
+the [3, ...] scratch array work (see _reusework)."""
+
+    # At 2x2 the explicit products beat the overhead of the batched
+    # matmul machinery. Since C is symmetric, so is the result, and
+    # we only need to compute three of its elements. Indexing with
+    # ellipses lets J or C be a single 2x2.
+    a, b = J[...,0,0], J[...,0,1]
+    c, d = J[...,1,0], J[...,1,1]
+    cxx, cxy, cyy = C[...,0,0], C[...,0,1], C[...,1,1]
+
+    shp = np.broadcast_shapes(np.shape(a), np.shape(cxx))
+    dtype = np.result_type(J, C)
+    out = _outok(out, J, C)
+    if out is None:
+        out = _empty22(shp, dtype=dtype)
+
+    # Temporaries are allocated once (unless supplied) and re-used
+    work = _reusework(_outok(work, J, C, out), 3, shp, dtype)
+    t0, t1, tmp = [work[k,...] for k in range(3)]
+    np.multiply(a, cxx, out=t0)
+    np.multiply(b, cxy, out=tmp)
+    t0 += tmp
+    np.multiply(a, cxy, out=t1)
+    np.multiply(b, cyy, out=tmp)
+    t1 += tmp
+
+    # first row of J.C.J^T
+    np.multiply(t0, a, out=out[...,0,0])
+    np.multiply(t1, b, out=tmp)
+    out[...,0,0] += tmp
+    np.multiply(t0, c, out=out[...,0,1])
+    np.multiply(t1, d, out=tmp)
+    out[...,0,1] += tmp
+
+    # second row of J.C
+    np.multiply(c, cxx, out=t0)
+    np.multiply(d, cxy, out=tmp)
+    t0 += tmp
+    np.multiply(c, cxy, out=t1)
+    np.multiply(d, cyy, out=tmp)
+    t1 += tmp
+
+    np.multiply(t0, c, out=out[...,1,1])
+    np.multiply(t1, d, out=tmp)
+    out[...,1,1] += tmp
+    out[...,1,0] = out[...,0,1]
+
+    return out
+
+def _buildpowers(deg=2):
+
+    """Returns the powers and selected indices for a 2D polynomial of
+degree deg, as read-only arrays (ipow, jpow, bpow, isel, jsel, lvander)"""
+
+    # powers following the convention of numpy's polynomial model
+    vpow = np.arange(deg+1)
+    ipow = np.repeat(vpow, deg+1)
+    jpow = np.tile(vpow, deg+1)
+
+    # boolean for powers <= deg, and the same selection as flat
+    # integer indices so that later selections can use np.take
+    # rather than boolean indexing
+    bpow = ipow + jpow <= deg
+    lvander = np.flatnonzero(bpow).astype(np.intp)
+    isel = np.take(ipow, lvander).astype(np.intp)
+    jsel = np.take(jpow, lvander).astype(np.intp)
+
+    # These are shared between instances, so protect them.
+    powers = (ipow, jpow, bpow, isel, jsel, lvander)
+    for arr in powers:
+        arr.setflags(write=False)
+
+    return powers
+
+def _eval_tan2equ(xi=np.array([]), eta=np.array([]), gamma=np.array([]), \
+                  alpha0=0., cosd0=1., sind0=0., work=None):
+
+    """Returns the equatorial coordinates alpha, delta (radians) of
+tangent plane coordinates xi, eta (radians), given gamma = cos(delta0)
+- eta sin(delta0), the tangent point right ascension alpha0 and the
+trig of its declination. If supplied, the intermediate is written into
+the [1, ...] scratch array work (see _reusework)."""
+
+    # Each output is built up in place, with one more buffer for
+    # sqrt(xi**2 + gamma**2). (Allocated explicitly so that scalar
+    # inputs work too.) Using arctan2 rather than arctan of the ratio
+    # saves the division, and puts alpha in the right quadrant should
+    # gamma go negative (points more than 90 degrees from the tangent
+    # point).
+    shp = np.shape(gamma)
+    dtype = np.result_type(xi, gamma)
+    alphaf, deltaf = [np.empty(shp, dtype=dtype) for k in range(2)]
+    rho = _reusework(work, 1, shp, dtype)[0,...]
+        
+    np.arctan2(xi, gamma, out=alphaf)
+    alphaf += alpha0
+
+    np.hypot(xi, gamma, out=rho)
+    np.multiply(eta, cosd0, out=deltaf)
+    deltaf += sind0
+    np.arctan2(deltaf, rho, out=deltaf)
+
+    return alphaf, deltaf
+
+def _eval_jac_tan2equ(xi=np.array([]), eta=np.array([]), gamma=np.array([]), \
+                      cosd0=1., sind0=0., out=None, work=None):
+
+    """Returns the [N,2,2] jacobian d(alpha, delta)/d(xi, eta) for
+tangent plane coordinates xi, eta (radians), given gamma = cos(delta0)
+- eta sin(delta0) and the trig of the tangent point declination. If
+supplied, the result is written into out, and the intermediates into
+the [5, ...] scratch array work."""
+
+    # Each term is written straight into its slot in the output,
+    # with the shared pieces computed once.
+    dtype = np.result_type(xi, eta, gamma)
+    out = _outok(out, xi, eta, gamma)
+    if out is None:
+        out = _empty22(np.shape(xi), dtype=dtype)
+
+    # The shared pieces are built up in place, so that each costs
+    # one N-sized array rather than a temporary per operation.
+    # (Allocated explicitly so that scalar inputs work too.)
+    shp = np.shape(out)[:-2]
+    work = _reusework(work, 5, shp, dtype)
+    xi2, onexi2, rho2, invrho2, invden = [work[k,...] for k in range(5)]
+    
+    np.multiply(xi, xi, out=xi2)
+    np.add(xi2, 1.0, out=onexi2)
+    np.multiply(gamma, gamma, out=rho2)
+    rho2 += xi2
+    np.divide(1.0, rho2, out=invrho2)
+
+    # denominator of the two declination terms, 1/[(1 + xi**2 +
+    # eta**2) sqrt(xi**2 + gamma**2)]. (rho2 is not needed after
+    # this.)
+    np.multiply(eta, eta, out=invden)
+    invden += onexi2
+    np.sqrt(rho2, out=rho2)
+    invden *= rho2
+    np.divide(1.0, invden, out=invden)
+
+    # dalpha / dxi (= 1/[gamma (1 + (xi/gamma)**2)] )
+    np.multiply(gamma, invrho2, out=out[...,0,0])
+
+    # dalpha / deta
+    np.multiply(xi, invrho2, out=out[...,0,1])
+    out[...,0,1] *= sind0
+
+    # ddelta / dxi
+    np.multiply(eta, cosd0, out=out[...,1,0])
+    out[...,1,0] += sind0
+    out[...,1,0] *= xi
+    out[...,1,0] *= -invden
+
+    # ddelta / deta
+    np.multiply(onexi2, cosd0, out=out[...,1,1])
+    np.multiply(eta, sind0, out=xi2)
+    out[...,1,1] -= xi2
+    out[...,1,1] *= invden
+
+    return out
+
+def _reusework(work=None, nbuf=1, shp=(), dtype=np.float64):
+
+    """Returns the first nbuf rows of scratch array work if it has at
+least that many rows of shape shp and type dtype, otherwise a new
+[nbuf, ...] array. Used to keep per-instance scratch space for the
+projection kernels across repeated calls on the same number of
+points."""
+
+    shp = tuple(shp)
+    if work is not None and work.shape[1:] == shp \
+       and work.shape[0] >= nbuf and work.dtype == dtype:
+        return work[0:nbuf]
+
+    return np.empty((nbuf,) + shp, dtype=dtype)
+
+def _trig_equ2tan(alpha=np.array([]), delta=np.array([]), alpha0=0., \
+                  work=None):
+
+    """Returns cos(alpha - alpha0), sin(alpha - alpha0), cos(delta),
+sin(delta) for the equatorial-to-tangent plane kernels, each evaluated
+once into its own buffer. If supplied (see _reusework), the buffers
+are the first four rows of scratch array work."""
+
+    shp = np.broadcast_shapes(np.shape(alpha), np.shape(delta))
+    dtype = np.result_type(alpha, delta, 1.0)
+
+    # (indexing with the ellipsis keeps scalar rows as 0-d arrays)
+    work = _reusework(work, 4, shp, dtype)
+    cosda, sinda, cosd, sind = [work[k,...] for k in range(4)]
+
+    np.subtract(alpha, alpha0, out=sinda)
+    np.cos(sinda, out=cosda)
+    np.sin(sinda, out=sinda)
+    np.cos(delta, out=cosd)
+    np.sin(delta, out=sind)
+
+    return cosda, sinda, cosd, sind
+
+def _eval_jac_equ2tan(alpha=np.array([]), delta=np.array([]), alpha0=0., \
+                      cosd0=1., sind0=0., out=None, work=None):
+
+    """Returns the [N,2,2] jacobian d(xi, eta)/d(alpha, delta) for
+equatorial coordinates alpha, delta (radians), given the tangent point
+right ascension alpha0 and the trig of its declination. If supplied,
+the result is written into out, and the intermediates into the [6,
+...] scratch array work."""
+
+    shp = np.broadcast_shapes(np.shape(alpha), np.shape(delta))
+    work = _reusework(work, 6, shp, np.result_type(alpha, delta, 1.0))
+    cosda, sinda, cosd, sind = _trig_equ2tan(alpha, delta, alpha0, work)
+    
+    out = _outok(out, alpha, delta)
+    if out is None:
+        out = _empty22(shp, dtype=cosda.dtype)
+
+    # We have the same denominator for all four terms,
+    # 1/(cos(da) cos(d) cos(d0) + sin(d) sin(d0))**2
+    invdenom = work[4,...]
+    tmp = work[5,...]
+    np.multiply(cosda, cosd, out=invdenom)
+    invdenom *= cosd0
+    np.multiply(sind, sind0, out=tmp)
+    invdenom += tmp
+    invdenom *= invdenom
+    np.divide(1.0, invdenom, out=invdenom)
+
+    # dxi/dalpha, up to the factor cos(d)/denom it shares with
+    # deta/dalpha
+    np.multiply(cosd, cosd0, out=out[...,0,0])
+    np.multiply(cosda, sind, out=tmp)
+    tmp *= sind0
+    out[...,0,0] += tmp
+
+    # cos(d) is not needed on its own after this, so its buffer
+    # takes the shared factor
+    cosd *= invdenom
+    out[...,0,0] *= cosd
+
+    # dxi/ddelta
+    np.multiply(sinda, -sind0, out=out[...,0,1])
+    out[...,0,1] *= invdenom
+
+    # deta/dalpha (0.5 sin(2 delta) = sin(delta) cos(delta))
+    np.multiply(sinda, sind, out=out[...,1,0])
+    out[...,1,0] *= cosd
+
+    # deta/ddelta
+    np.multiply(cosda, invdenom, out=out[...,1,1])
+
+    return out
+
+def _eval_equ2tan(alpha=np.array([]), delta=np.array([]), alpha0=0., \
+                  cosd0=1., sind0=0., work=None):
+
+    """Returns the tangent plane coordinates xi, eta (radians) of
+equatorial coordinates alpha, delta (radians), given the tangent point
+right ascension alpha0 and the trig of its declination. If supplied,
+the intermediates are written into the [5, ...] scratch array work."""
+
+    # Each trig function of the inputs is evaluated just once, and
+    # cos(delta) cos(alpha - alpha0) (which appears in both the
+    # denominator and eta) is formed once, in place of cos(da).
+    shp = np.broadcast_shapes(np.shape(alpha), np.shape(delta))
+    work = _reusework(work, 5, shp, np.result_type(alpha, delta, 1.0))
+    cosda, sinda, cosd, sind = _trig_equ2tan(alpha, delta, alpha0, work)
+    cosdcosda = cosda
+    cosdcosda *= cosd
+
+    # (xi and eta are returned, so are always new arrays)
+    denom = work[4,...]
+    xi, eta = [np.empty(shp, dtype=cosda.dtype) for k in range(2)]
+
+    # cos(da) cos(d) cos(d0) + sin(d) sin(d0), with xi as scratch
+    np.multiply(cosdcosda, cosd0, out=denom)
+    np.multiply(sind, sind0, out=xi)
+    denom += xi
+
+    np.multiply(cosd, sinda, out=xi)
+    xi /= denom
+
+    # (sin(da) is no longer needed, so serves as scratch)
+    np.multiply(sind, cosd0, out=eta)
+    np.multiply(cosdcosda, sind0, out=sinda)
+    eta -= sinda
+    eta /= denom
+
+    return xi, eta
 
 class Patternmatrix(object):
 
@@ -32,14 +754,24 @@ linear model
     """
 
     def __init__(self, deg=2, x=np.array([]), y=np.array([]), \
-                 kind='Polynomial', norescale=False):
+                 kind='Polynomial', norescale=False, dtype=np.float64):
 
         # degree
         self.deg = deg
 
-        # input points
-        self.x = np.copy(x)
-        self.y = np.copy(y)
+        # datatype for the vandermonde and pattern arrays. float32
+        # halves the memory traffic when building and using the
+        # pattern. The bases are evaluated on [-1, 1], so this is
+        # usually fine, but the precision of the higher-order terms
+        # (and of the normal equations built from them) degrades
+        # quickly for deg > 6. Stick with float64 there.
+        self.dtype = np.dtype(dtype)
+
+        # input points. These are not modified here, so rather than
+        # copying them we keep read-only views (the caller's arrays
+        # are unaffected).
+        self.x = _readonlyview(x)
+        self.y = _readonlyview(y)
         
         # control variable for rescaling
         self.norescale = norescale
@@ -52,16 +784,12 @@ linear model
         self.setlims()
         self.rescalexy()
         
-        # Method selection
-        self.kind=kind[:]
-        self.methvander = polynomial.polynomial.polyvander2d
-        self.meths = \
-            { 'Polynomial':polynomial.polynomial.polyvander2d, \
-              'Chebyshev':polynomial.chebyshev.chebvander2d, \
-              'Legendre':polynomial.legendre.legvander2d, \
-              'Hermite':polynomial.hermite.hermvander2d, \
-              'HermiteE':polynomial.hermite_e.hermevander2d}
-
+        # Method selection. We use the 1D vandermonde methods and
+        # build the 2D terms ourselves, so that only the terms with
+        # i + j <= deg are ever computed.
+        self.kind = kind
+        self.kind_enum = PolyKind.POLY
+        self.methvander = _VANDER[PolyKind.POLY]
         self.setmethvander()
                 
         # powers following the convention of numpy's polynomial model
@@ -73,16 +801,25 @@ linear model
         self.isel = np.array([])
         self.jsel = np.array([])
 
-        # selected indices in the vandermonde array
+        # selected indices in the full (deg+1)**2 vandermonde array
+        # that numpy's *vander2d methods would produce
         self.lvander = np.array([])
         
-        # vandermonde array, pattern matrix
+        # vandermonde array (selected terms only), pattern matrix
         self.vander = np.array([])
         self.pattern = np.array([])
+
+        # What the vandermonde array was built for: the kind, degree
+        # and datatype, and copies of the rescaled positions. Set by
+        # buildvander().
+        self._vanderkey = None
+
+        # The [N, nbases] block that appears twice on the diagonal of
+        # the pattern matrix
+        self.pattern_compact = np.array([])
         
         # set the indices
-        self.buildpowers()
-        self.selectpowers()
+        self.setpowers()
 
         # build the vandermonde array and the pattern matrix
         self.buildvander()
@@ -121,52 +858,90 @@ linear model
 
         # Set a default if the selected method is not in the allowed
         # list
-        if not self.kind in self.meths.keys():
-            self.kind = 'Polynomial'
+        self.kind_enum = _KINDS.get(self.kind, PolyKind.POLY)
+        self.kind = _KINDNAMES[self.kind_enum]
 
-        self.methvander = self.meths[self.kind]
+        self.methvander = _VANDER[self.kind_enum]
             
-    def buildpowers(self):
-
-        """Sets up the powers arrays from the degree"""
-
-        vpow = np.arange(self.deg+1)
-        self.ipow = np.repeat(vpow, self.deg+1)
-        self.jpow = np.tile(vpow, self.deg+1)
-
-    def selectpowers(self):
-
-        """Sets boolean for powers of the proper degree"""
-
-        self.bpow = self.ipow + self.jpow <= self.deg    
+    def setpowers(self):
 
-        self.isel = self.ipow[self.bpow]
-        self.jsel = self.jpow[self.bpow]
+        """Sets the powers arrays and the selection of powers of the proper
+degree, from the module-level cache"""
 
-        ldum = np.arange(np.size(self.ipow))
-        self.lvander = ldum[self.bpow]
+        if self.deg not in _POWERS_CACHE:
+            _POWERS_CACHE[self.deg] = _buildpowers(self.deg)
+        
+        self.ipow, self.jpow, self.bpow, \
+            self.isel, self.jsel, self.lvander = _POWERS_CACHE[self.deg]
         
     def buildvander(self):
 
-        """Makes vandermonde array"""
+        """Makes vandermonde array, [N, nbases], for the selected powers
+only. Column k is the basis with powers (isel[k], jsel[k]), so this
+is the same as numpy's *vander2d output at columns lvander."""
 
         # Note that this works on the rescaled x, y
         
         if np.size(self.xr) < 1:
             return
+
+        # In typical use the positions and degree stay fixed and only
+        # the coefficients change, so if the array is already built for
+        # these we keep it. Comparing the rescaled positions (rather
+        # than x, y) means that a change in the domain limits is picked
+        # up as well.
+        key = (self.kind, self.deg, self.dtype)
+        if self._vanderkey is not None and self._vanderkey[0] == key \
+           and np.array_equal(self._vanderkey[1], self.xr, equal_nan=True) \
+           and np.array_equal(self._vanderkey[2], self.yr, equal_nan=True):
+            return
         
-        deg2 = (self.deg, self.deg)
-        self.vander = self.methvander(self.xr, self.yr, deg2)
+        # The 1D vandermonde arrays are only [N, deg+1] each. The
+        # product then materializes just the (deg+1)(deg+2)/2 terms
+        # we use, rather than all (deg+1)**2 of them.
+        #
+        # We go one basis at a time, with the 1D bases transposed so
+        # that each is a contiguous row, and write every product
+        # straight into its column of the output (converting to
+        # self.dtype on the way). This avoids the two gathered [N,
+        # nbases] temporaries, and their product, that fancy indexing
+        # would create. The output is column-major, matching the
+        # pattern matrix, so that each column is contiguous too.
+        vx = np.ascontiguousarray(self.methvander(self.xr, self.deg).T)
+        vy = np.ascontiguousarray(self.methvander(self.yr, self.deg).T)
+
+        nbases = np.size(self.isel)
+        self.vander = np.empty((np.size(self.xr), nbases), \
+                               dtype=self.dtype, order='F')
+        for k in range(nbases):
+            np.multiply(vx[self.isel[k]], vy[self.jsel[k]], \
+                        out=self.vander[:,k])
+
+        # The array is re-used while the key matches, so protect it
+        # against modification.
+        self.vander.setflags(write=False)
+        self._vanderkey = (key, np.copy(self.xr), np.copy(self.yr))
+
+    def invalidate_cache(self):
+
+        """Forces the next buildvander() to rebuild this instance's
+vandermonde array"""
+
+        self._vanderkey = None
 
     def initpattern(self):
 
         """Initialize the pattern matrix"""
 
         npoints = np.size(self.xr)
-        ncols = 2*np.sum(self.bpow)
+        ncols = 2*self.lvander.size
         nrows = 2
 
-        self.pattern = np.zeros(( npoints, nrows, ncols))
+        # Every element is written by buildpattern(), so there is no
+        # need to zero the array here. The pattern is consumed one
+        # basis (column) at a time, so we store it column-major.
+        self.pattern = np.empty(( npoints, nrows, ncols), \
+                                dtype=self.dtype, order='F')
         
     def buildpattern(self):
 
@@ -175,8 +950,17 @@ linear model
         self.initpattern()
         nbases = np.size(self.lvander)
 
-        self.pattern[:,0, 0:nbases] = self.vander[:,self.lvander]
-        self.pattern[:,1, nbases::] = self.vander[:,self.lvander]
+        # The pattern is block-diagonal: the same [N, nbases] block
+        # for x and y, with zeros off the diagonal. Select the block
+        # just once and keep it so that callers can exploit the
+        # structure.
+        sub = self.vander
+        self.pattern_compact = sub
+        
+        self.pattern[:,0, 0:nbases] = sub
+        self.pattern[:,0, nbases::] = 0.
+        self.pattern[:,1, 0:nbases] = 0.
+        self.pattern[:,1, nbases::] = sub
         
     def showbases(self, fignum=1, showcolorbar=False, \
                   showindices=True, fsz=6, cmap='viridis'):
@@ -196,6 +980,8 @@ linear model
         if self.deg > 7:
             fontsize=6
         
+        plt = _getplt()
+
         fig1=plt.figure(fignum, figsize=(fsz,fsz))
         fig1.clf()
         axes = []
@@ -247,7 +1033,7 @@ coefficients and the 2D convention expected by numpy methods"""
     def __init__(self, p=np.array([]), Verbose=True, slabel='A'):
 
         # flat coefficients
-        self.p = p
+        self.p = np.asarray(p)
 
         # Print warnings?
         self.Verbose = Verbose
@@ -263,6 +1049,15 @@ coefficients and the 2D convention expected by numpy methods"""
         self.i = np.array([])
         self.j = np.array([])
 
+        # flat coefficients as of the last update of the 2D array,
+        # so that we only need to write the entries that changed
+        self._p_prev = np.array([])
+
+        # Incremented whenever the 2D coefficients change, so that
+        # objects holding quantities derived from them can tell
+        # whether they are stale
+        self.version = 0
+
         # Returning labels
         self.slabel=slabel[:]
         self.plotlabels = []
@@ -278,23 +1073,26 @@ coefficients and the 2D convention expected by numpy methods"""
 
         """Returns the degree given the number of coefficients"""
 
-        d = (-3. + np.sqrt(9.0 + 8.*(m-1.) ))/2.
-
-        return d
+        return degfromcoeffs(m)
 
     def ijfromdeg(self, deg=2):
 
         """Returns the i, j indices for the coefficients given the degree"""
 
         # useful to have as a method that returns values
-        
-        iarr = np.array([], dtype='int')
-        jarr = np.array([], dtype='int')
 
-        for iterm in range(deg+1):
-            count = np.arange(iterm+1, dtype='int')
-            jarr = np.hstack(( jarr, count ))
-            iarr = np.hstack(( iarr, count[::-1] ))
+        # Terms are ordered by total power i + j, and by increasing j
+        # within each total power: (0,0), (1,0), (0,1), (2,0), (1,1),
+        # (0,2), ... We build this in one shot rather than growing
+        # the arrays one total-power at a time.
+        ktot = np.arange(deg+1, dtype='int')
+        totarr = np.repeat(ktot, ktot+1)
+
+        # j counts up from zero within each block of equal total
+        # power. The blocks start at k(k+1)/2.
+        kstart = np.repeat(ktot*(ktot+1)//2, ktot+1)
+        jarr = np.arange(totarr.size, dtype='int') - kstart
+        iarr = totarr - jarr
 
         return iarr, jarr
 
@@ -324,6 +1122,10 @@ coefficients and the 2D convention expected by numpy methods"""
         """Sets up empty 2d array of coefficients"""
 
         self.p2d = np.zeros(( self.deg+1, self.deg+1 ))
+        self.version += 1
+
+        # the 2D array is blank, so the next update must fill it all
+        self._p_prev = np.array([])
 
     def updatecoeffs(self, p=np.array([]) ):
 
@@ -333,7 +1135,7 @@ coefficients and the 2D convention expected by numpy methods"""
         if np.size(p) < 1:
             return
 
-        self.p = p
+        self.p = np.asarray(p)
         self.updatecoeffs2d()
         
     def updatecoeffs2d(self):
@@ -346,8 +1148,18 @@ coefficients and the 2D convention expected by numpy methods"""
                 print("Polycoeffs.updatecoeffs2d WARN - degree < 0. Check length of parameter-set")
             return
         
-        l = np.arange(np.size(self.p))
+        # If the previous parameters are comparable, write only the
+        # entries that changed (e.g. one-at-a-time MCMC
+        # proposals). Otherwise fill the whole array.
+        if self._p_prev.shape == self.p.shape:
+            l = np.flatnonzero(self.p != self._p_prev)
+        else:
+            l = np.arange(self.p.shape[0])
         self.p2d[self.i[l],self.j[l]] = self.p[l]
+        if l.size > 0:
+            self.version += 1
+
+        self._p_prev = np.array(self.p, copy=True)
 
     def getcoeffs2d(self, p=np.array([]), clobber=False):
 
@@ -356,7 +1168,7 @@ coefficients and the 2D convention expected by numpy methods"""
         # If no input supplied, use whatever parameters are already
         # primed in the instance.
         if np.size(p) > 0:
-            self.p = p
+            self.p = np.asarray(p)
 
         # (re-) assign the degree and indices arrays if not already
         # set, OR if input keyword "clobber" is set.
@@ -390,6 +1202,17 @@ default."""
         self.plotlabels = plotlabels[:]
         self.slabel = slabel[:]
 
+def _tponly(pars=np.array([]), lastpars=None):
+
+    """Returns True if the full parameter vector pars ([alpha0, delta0,
+parsxy]) differs from lastpars at most in the tangent point"""
+
+    if lastpars is None or np.shape(pars) != np.shape(lastpars) \
+       or np.size(pars) < 2:
+        return False
+
+    return np.array_equal(pars[2::], lastpars[2::])
+
 class Parvec(object):
 
     """Polynomial parameters and tangent point parameters"""
@@ -435,7 +1258,7 @@ Returns: N/A
         if np.size(pars) < 2:
             return
 
-        self.tangentpoint = pars[0:2]
+        self.tangentpoint = np.copy(pars[0:2])
 
         # Handle the remaining parameters
         if np.size(pars) < 3:
@@ -457,10 +1280,11 @@ Returns: N/A
         # Set the attribute for the abcdef parameters
         self.inds1d_6term = [0,2,3,1, imid+2, imid+3]
         
-        PC = Polycoeffs(Verbose=False)
-        degx = PC.degfromcoeffs(parsx.size)
+        # (The degree is closed-form, so no need to build a
+        # Polycoeffs object just to find it.)
+        degx = degfromcoeffs(parsx.size)
         if degx - int(degx) > 0:
-            degx = PC.degfromcoeffs(parsx.size+1)
+            degx = degfromcoeffs(parsx.size+1)
 
             # If this *still* isn't an integer, the polynomial class
             # isn't going to handle the parameters. In that instance,
@@ -477,7 +1301,9 @@ Returns: N/A
             self.parsx = np.hstack(( 0., parsx ))
             self.parsy = np.hstack(( 0., parsy ))
             return
-            
+
+        # Copies, not views: the caller may reuse its parameter
+        # vector (and these are only a few elements long)
         self.parsx = np.copy(parsx)
         self.parsy = np.copy(parsy)
 
@@ -517,6 +1343,11 @@ Inputs:
     xisxi = adjust plot labels so that we're going from (xi, eta) to
     (x,y). If False, the input x, y are assumed to be detector X, Y.
 
+    dtype = floating point type for the positions, jacobians and
+    covariances. np.float32 halves the memory traffic for large
+    Monte Carlo sets where a few digits of precision are enough. (The
+    coefficients are cast to the same type when evaluated.)
+
     checkparsy = split parsx across parsx and parsy
 
     radec = unused, included for compatibility
@@ -546,17 +1377,45 @@ Inputs:
                  kindpoly='Polynomial', Verbose=False, \
                  xmin=None, xmax=None, ymin=None, ymax=None, \
                  xisxi=False, checkparsy=False, \
-                 radec=None, covradec=None):
+                 radec=None, covradec=None, dtype=np.float64):
 
         # Inputs
         #self.x = x
         #self.y = y
         #self.covxy = covxy
 
-        # Use the same method we'll use later on if we update
+        # 1D basis tables [N, deg+1] evaluated at the rescaled
+        # positions xr, yr, and a copy of the (x, y) positions that
+        # xr, yr were computed from. Set by rescalepos().
+        self.xr = np.array([])
+        self.yr = np.array([])
+        self._XP = None
+        self._YP = None
+        self._xrsrc = None
+        self._yrsrc = None
+
+        # Transformed positions evaluated along with the jacobian (at
+        # xr, yr), and whether they are valid for the current
+        # parameters, so that tranpos() need not redo them.
+        self._xtranr = np.array([])
+        self._ytranr = np.array([])
+        self._tranfresh = False
+        
+        # Floating point type for the data and the propagated
+        # quantities
+        self.dtype = np.dtype(dtype)
+        
+        # Use the same method we'll use later on if we update. The
+        # number of datapoints is kept as self._nx so that we don't
+        # have to keep asking for it.
         self.x = np.array([])
         self.y = np.array([])
         self.covxy = np.array([])
+        self._nx = 0
+        # Counts changes made to the input positions through this
+        # object (new data, nudges), so that objects chaining this one
+        # can tell when their propagated positions are out of date.
+        self._posgen = 0
         self.updatedata(x, y, covxy)
         self.parsx = np.array(parsx)
         self.parsy = np.array(parsy)
@@ -599,6 +1458,24 @@ Inputs:
         self.cxy = np.array([])
         self.cyx = np.array([])
         self.cyy = np.array([])
+
+        # ... and all four stacked together as [4, deg+1, deg+1] so
+        # that they can be evaluated in a single pass. This is a view
+        # of the [6, deg+1, deg+1] block self._cfull, which holds the
+        # position coefficients in front of the derivatives, and is
+        # only re-allocated when the shape changes. self._dckey
+        # records which coefficients it was filled from.
+        self.cstack = np.array([])
+        self._cfull = np.array([])
+        self._dckey = None
+
+        # The coefficients and rescaled positions the polynomial
+        # jacobian was last evaluated for, and the (rescaling,
+        # polynomial) jacobians the combined jacobian was formed
+        # from, so that unchanged ones aren't recomputed
+        self._jpkey = None
+        self._jpsrc = (None, None, None)
+        self._jacsrc = (None, None)
             
         # rescaled x, y to the [-1, 1] interval, and scaling factors
         self.jacrescale = np.eye(2)
@@ -618,24 +1495,12 @@ Inputs:
         # input to the 2D that the polynomial methods will expect:
         self.setuppars()
 
-        # 2024-11-12 note: updated these names to _list just now to
-        # avoid overloading.
-        self.methval2dlist = {'Polynomial':polynomial.polynomial.polyval2d, \
-                          'Chebyshev':polynomial.chebyshev.chebval2d, \
-                          'Legendre':polynomial.legendre.legval2d, \
-                          'Hermite':polynomial.hermite.hermval2d, \
-                          'HermiteE':polynomial.hermite_e.hermeval2d}
-
-        self.methderlist = {'Polynomial':polynomial.polynomial.polyder, \
-                        'Chebyshev':polynomial.chebyshev.chebder, \
-                        'Legendre':polynomial.legendre.legder, \
-                        'Hermite':polynomial.hermite.hermder, \
-                        'HermiteE':polynomial.hermite_e.hermeder}
-
-        
-        # Polynomial object and methods to use
-        self.polysallowed = list(self.methderlist.keys()) # 2024-07-27 made a list
-        self.kind = kindpoly[:]
+        # Polynomial object and methods to use. The methods
+        # themselves are looked up from the module-level tables
+        # indexed by PolyKind.
+        self.polysallowed = list(_KINDNAMES) # 2024-07-27 made a list
+        self.kind = kindpoly
+        self.kind_enum = PolyKind.POLY
         self.checkpolysupported()
         self.setmethods()
         
@@ -705,8 +1570,7 @@ corresponds to {a,b,c,d,e,f} in
         """Utility - initializes xytran convenience variable using the size of
 the dataset"""
 
-        npts = np.size(self.x)
-        self.xytran = np.zeros(( npts, 2 ))
+        self.xytran = np.zeros(( self._nx, 2 ), dtype=self.dtype)
         
     def setdomain(self, clobber=False):
 
@@ -718,13 +1582,13 @@ the dataset"""
         # Note that the user doesn't need to supply actual data, only
         # the minmax values. If all four are supplied, this is valid.
 
-        nx = np.size(self.x)
-        ny = np.size(self.y)
+        nx = self._nx
+        ny = self._nx
 
-        # self.xmin is an np.ndarray even if None is passed in...
-        # so self.xmin is None --> self.xmin == None throughout this method
+        # updatelimits() stores unset limits as None (and set ones as
+        # plain scalars)
         
-        if self.xmin == None:
+        if self.xmin is None:
             if nx > 0:
                 self.xmin = np.min(self.x)
             else:
@@ -733,7 +1597,7 @@ the dataset"""
             if nx > 0 and clobber:
                 self.xmin = np.min([self.xmin, np.min(self.x)])
             
-        if self.xmax == None:
+        if self.xmax is None:
             if nx > 0:
                 self.xmax = np.max(self.x)
             else:
@@ -742,7 +1606,7 @@ the dataset"""
             if nx > 0 and clobber:
                 self.xmax = np.max([self.xmin, np.max(self.x)])
 
-        if self.ymin == None:
+        if self.ymin is None:
             if ny > 0:
                 self.ymin = np.min(self.y)
             else:
@@ -751,7 +1615,7 @@ the dataset"""
             if ny > 0 and clobber:
                 self.ymin = np.min([self.ymin, np.min(self.y)])
             
-        if self.ymax == None:
+        if self.ymax is None:
             if ny > 0:
                 self.ymax = np.max(self.y)
             else:
@@ -765,8 +1629,21 @@ the dataset"""
         """Sets the jacobian for the rescaling of the input positions"""
                 
         self.jacrescale = np.array( [[2.0/(self.xmax - self.xmin), 0.], \
-                                     [0., 2.0/(self.ymax - self.ymin)] ] )
+                                     [0., 2.0/(self.ymax - self.ymin)] ], \
+                                    dtype=self.dtype)
+
+        self.setrescale()
+
+    def setrescale(self):
 
+        """Sets the affine coefficients for rescaling positions to [-1, 1],
+so that xr = ax * x + bx"""
+
+        self._ax = 2.0/(self.xmax - self.xmin)
+        self._bx = 0. - (self.xmax + self.xmin)/(self.xmax - self.xmin)
+        self._ay = 2.0/(self.ymax - self.ymin)
+        self._by = 0. - (self.ymax + self.ymin)/(self.ymax - self.ymin)
+        
         
     def rescalepos(self):
 
@@ -774,13 +1651,108 @@ the dataset"""
 this rescaling"""
         
         self.xr, self.yr = self.rescalexy(self.x, self.y)
+        self._nx = self.xr.shape[0] if self.xr.ndim else 0
+
+        # Remember which positions these are (by value: the positions
+        # can be changed in place), and evaluate the basis tables at
+        # them so that the positions and all four jacobian terms can
+        # share them.
+        self._xrsrc = np.copy(self.x)
+        self._yrsrc = np.copy(self.y)
+        self._tranfresh = False
+        self.setbasistables()
+
+    def setbasistables(self):
+
+        """Evaluates the 1D basis tables at the rescaled positions xr, yr, up
+to the degree of the instance's polynomials"""
+
+        ndeg = max(np.shape(self.pars2x.p2d)[0], \
+                   np.shape(self.pars2y.p2d)[0]) - 1
+        
+        if ndeg < 0 or self.xr.size < 1:
+            self._XP = None
+            self._YP = None
+            return
+
+        self._XP = self.methvander(self.xr, ndeg)
+        self._YP = self.methvander(self.yr, ndeg)
+
+    def tablesok(self, ncols=1):
+
+        """Returns True if the basis tables are set and have at least ncols
+columns"""
+
+        if self._XP is None or self._YP is None:
+            return False
+
+        return self._XP.shape[1] >= ncols and self._YP.shape[1] >= ncols
+        
+    def posfresh(self):
+
+        """Returns True if the rescaled positions (and basis tables) still
+correspond to the instance's x, y positions"""
+
+        # Compared by value, so that in-place changes to x, y are
+        # caught as well as reassignment. This is O(N), much cheaper
+        # than re-evaluating the tables.
+        if self._xrsrc is None or self._yrsrc is None:
+            return False
+
+        return np.array_equal(self.x, self._xrsrc, equal_nan=True) \
+            and np.array_equal(self.y, self._yrsrc, equal_nan=True)
+
+    def evaltables(self, c=np.array([]) ):
+
+        """Evaluates 2D coefficients c at the rescaled positions xr, yr using
+the basis tables"""
+
+        dtype = np.result_type(self._XP, self._YP)
+        ops = (self._XP[:,0:c.shape[0]], self._YP[:,0:c.shape[1]], \
+               c.astype(dtype, copy=False))
+        
+        return np.einsum('ni,nj,ij->n', *ops, \
+                         optimize=_einsumpath('ni,nj,ij->n', *ops))
+
+    def evalstack(self, XP=np.array([]), YP=np.array([]), \
+                  cstack=np.array([]) ):
+
+        """Evaluates a [K, nx, ny] stack of 2D coefficient sets against 1D
+basis tables XP, YP (which may extend to higher degree than the
+coefficients) in a single contraction, returning [K, N]. The
+coefficients are cast to the type of the tables."""
+
+        dtype = np.result_type(XP, YP)
+        ops = (XP[:,0:cstack.shape[1]], YP[:,0:cstack.shape[2]], \
+               cstack.astype(dtype, copy=False))
+
+        # (the contraction path is planned once per set of shapes)
+        return np.einsum('ni,nj,kij->kn', *ops, \
+                         optimize=_einsumpath('ni,nj,kij->kn', *ops))
+
+    def poscoeffs(self):
+
+        """Returns the x and y position coefficients as a [2, nx, ny] stack,
+or None if the two have different shapes"""
+
+        if np.shape(self.pars2x.p2d) != np.shape(self.pars2y.p2d):
+            return None
+
+        # Already laid out if the derivatives are current
+        if np.ndim(self._cfull) == 3 and self.derivsfresh():
+            return self._cfull[0:2]
+
+        return np.stack(( self.pars2x.p2d, self.pars2y.p2d ))
 
     def rescalexy(self, x=np.array([]), y=np.array([])):
 
         """Rescales input x, y using the limits set for the object"""
 
-        xr = (2.0*x - (self.xmax + self.xmin))/(self.xmax - self.xmin)
-        yr = (2.0*y - (self.ymax + self.ymin))/(self.ymax - self.ymin)
+        # One multiply and one in-place add per coordinate
+        xr = np.multiply(x, self._ax)
+        xr += self._bx
+        yr = np.multiply(y, self._ay)
+        yr += self._by
 
         return xr, yr
         
@@ -790,21 +1762,26 @@ this rescaling"""
         
         self.pars2x = Polycoeffs(self.parsx, Verbose=self.Verbose)
         self.pars2y = Polycoeffs(self.parsy, Verbose=self.Verbose)
+        self._tranfresh = False
         
     def checkpolysupported(self):
 
         """Checks whether the requested polynomial type is supported
         """
 
-        # Implemented using a list of known-allowed rather than just
+        # Implemented using a lookup of known-allowed rather than just
         # using try/except because the exception handler could be
         # slow.
-        
-        if not self.kind in self.polysallowed:
+
+        kind_enum = _KINDS.get(self.kind)
+        if kind_enum is None:
             if self.Verbose:
                 print("Poly.checkpoly WARN - supplied polynomial %s not found. Defaulting to Polynomial" % (self.kind))
 
-            self.kind='Polynomial'
+            kind_enum = PolyKind.POLY
+
+        self.kind_enum = kind_enum
+        self.kind = _KINDNAMES[kind_enum]
 
     def setmethods(self):
 
@@ -823,8 +1800,17 @@ this rescaling"""
         # but the Hermite, the n=1 entry is just "x", which will make
         # testing the linear case easier.
         
-        self.methval2d = self.methval2dlist[self.kind]
-        self.methder = self.methderlist[self.kind]
+        self.methval2d = _VAL2D[self.kind_enum]
+        self.methder = _DER[self.kind_enum]
+
+        # For the ordinary polynomial (the common case) and
+        # Chebyshev we can skip numpy.polynomial's machinery when
+        # evaluating
+        if self.kind_enum == PolyKind.POLY:
+            self.methval2d = _polyval2d_fast
+        elif self.kind_enum == PolyKind.CHEB:
+            self.methval2d = _chebval2d_fast
+        self.methvander = _VANDER[self.kind_enum]
         
     def setpoly(self):
 
@@ -856,8 +1842,19 @@ this rescaling"""
             return np.array([]), np.array([])
 
         xr, yr = self.rescalexy(x, y)
-        xtran = self.methval2d(xr, yr, self.pars2x.p2d)
-        ytran = self.methval2d(xr, yr, self.pars2y.p2d)
+
+        # Both outputs share the basis tables at xr, yr, so if the
+        # coefficients have the same shape we build the tables once
+        # and evaluate the two together.
+        cpos = self.poscoeffs()
+        if cpos is None or np.ndim(xr) != 1:
+            xtran = self.methval2d(xr, yr, self.pars2x.p2d)
+            ytran = self.methval2d(xr, yr, self.pars2y.p2d)
+            return xtran, ytran
+
+        XP = self.methvander(xr, cpos.shape[1]-1)
+        YP = self.methvander(yr, cpos.shape[2]-1)
+        xtran, ytran = self.evalstack(XP, YP, cpos)
 
         return xtran, ytran
         
@@ -865,6 +1862,26 @@ this rescaling"""
 
         """Applies the transformation to the raw positions, updating instance quantities self.xtran, self.ytran"""
 
+        # If the positions have not changed since they were last
+        # rescaled, we can re-use the basis tables. If the
+        # transformed positions were already evaluated along with the
+        # jacobian, there's nothing to do.
+        if self.posfresh():
+            if self._tranfresh:
+
+                # Hand the evaluated positions over rather than keep
+                # them: xtran, ytran may be changed in place
+                # downstream (e.g. nudged by a following
+                # transformation that shares them).
+                self.xtran = self._xtranr
+                self.ytran = self._ytranr
+                self._xtranr = np.array([])
+                self._ytranr = np.array([])
+                self._tranfresh = False
+            else:
+                self.tranpos_r()
+            return
+        
         self.xtran, self.ytran = self.propxy(self.x, self.y)
         
     def tranpos_r(self):
@@ -872,14 +1889,32 @@ this rescaling"""
         """Applies the transformation (to the RESCALED positions over the
 domain [-1, 1])"""
 
-        self.xtran = self.methval2d(self.xr, self.yr, self.pars2x.p2d)
-        self.ytran = self.methval2d(self.xr, self.yr, self.pars2y.p2d)
+        ncols = max(np.shape(self.pars2x.p2d)[0], np.shape(self.pars2y.p2d)[0])
+        if not self.tablesok(ncols):
+            self.setbasistables()
 
-    def derivcoeffs(self, c=np.array([]) ):
+        # setbasistables() leaves the tables unset if there are no
+        # points or no parameters
+        if not self.tablesok(ncols):
+            self.xtran = self.methval2d(self.xr, self.yr, self.pars2x.p2d)
+            self.ytran = self.methval2d(self.xr, self.yr, self.pars2y.p2d)
+            return
+        
+        cpos = self.poscoeffs()
+        if cpos is not None:
+            self.xtran, self.ytran = self.evalstack(self._XP, self._YP, cpos)
+            return
+        
+        self.xtran = self.evaltables(self.pars2x.p2d)
+        self.ytran = self.evaltables(self.pars2y.p2d)
+
+    def derivcoeffs(self, c=np.array([]), out=None):
 
         """Given a 2d set of coefficients for a polynomial, returns the
 derivative wrt x as a coefficient set with the same dimensions as the
-original (i.e. padded at the highest power).
+original (i.e. padded at the highest power). If supplied, out is a
+pair of arrays of that shape into which the x- and y-derivatives are
+written.
 
         """
 
@@ -891,14 +1926,32 @@ original (i.e. padded at the highest power).
         if np.ndim(c) < 2:
             return np.array([0])
 
-        # Find the derivative along each axis...
-        cdx = self.methder(c, 1,1,axis=0)
-        cdy = self.methder(c, 1,1,axis=1)
-
-        # ... and pad so that the outputs are square with same dimensions
-        # as inputs.
-        cdx = np.pad(cdx, [[0,1], [0,0]] )
-        cdy = np.pad(cdy, [[0,0], [0,1]] )
+        # The outputs have the same dimensions as the inputs, with the
+        # highest power along the differentiated axis left at zero. We
+        # allocate them once and write the derivatives into them.
+        nx, ny = np.shape(c)
+        if out is None:
+            dtype = np.result_type(c.dtype, np.float64)
+            cdx = np.zeros((nx, ny), dtype=dtype)
+            cdy = np.zeros((nx, ny), dtype=dtype)
+        else:
+            cdx, cdy = out
+            cdx[-1,:] = 0.
+            cdy[:,-1] = 0.
+
+        # (nothing to do along an axis with only a constant term)
+        if self.kind_enum == PolyKind.POLY:
+            # For ordinary polynomials, d/dx (c_ij x^i y^j) = i c_ij
+            # x^(i-1) y^j, so we can write the coefficients directly.
+            if nx > 1:
+                cdx[:-1,:] = c[1:,:] * np.arange(1, nx)[:,np.newaxis]
+            if ny > 1:
+                cdy[:,:-1] = c[:,1:] * np.arange(1, ny)[np.newaxis,:]
+        else:
+            if nx > 1:
+                cdx[:-1,:] = self.methder(c, 1,1,axis=0)
+            if ny > 1:
+                cdy[:,:-1] = self.methder(c, 1,1,axis=1)
 
         return cdx, cdy
 
@@ -907,20 +1960,58 @@ original (i.e. padded at the highest power).
         """Sets up the coefficients of the polynomial derivatives that will be
 evaluated at x,y to populate the jacobian"""
 
-        self.cxx, self.cxy = self.derivcoeffs(self.pars2x.p2d)
-        self.cyx, self.cyy = self.derivcoeffs(self.pars2y.p2d)
+        # If the x and y polynomials are of different degree, the
+        # coefficients cannot be stacked. evaluatejacpoly() then falls
+        # back to evaluating them one at a time.
+        if np.ndim(self.pars2x.p2d) < 2 \
+           or np.shape(self.pars2x.p2d) != np.shape(self.pars2y.p2d):
+            self.cxx, self.cxy = self.derivcoeffs(self.pars2x.p2d)
+            self.cyx, self.cyy = self.derivcoeffs(self.pars2y.p2d)
+            self.cstack = np.array([])
+            self._cfull = np.array([])
+            self._dckey = self.coeffskey()
+            return
+
+        # Otherwise the derivatives are written straight into their
+        # slots in the existing layout, rather than into new arrays
+        # that are then copied across.
+        shp = (6,) + np.shape(self.pars2x.p2d)
+        if self._cfull.shape != shp or self._cfull.dtype != self.dtype:
+            self._cfull = np.empty(shp, dtype=self.dtype)
+        self._cfull[0] = self.pars2x.p2d
+        self._cfull[1] = self.pars2y.p2d
+        self.cxx, self.cxy = self.derivcoeffs(self.pars2x.p2d, \
+                                              out=self._cfull[2:4])
+        self.cyx, self.cyy = self.derivcoeffs(self.pars2y.p2d, \
+                                              out=self._cfull[4:6])
+        self.cstack = self._cfull[2:6]
+        self._dckey = self.coeffskey()
+
+    def coeffskey(self):
+
+        """Returns a key identifying the current x and y coefficients"""
+
+        return (self.pars2x, self.pars2x.version, \
+                self.pars2y, self.pars2y.version)
+
+    def derivsfresh(self):
+
+        """Returns True if the derivative coefficients (and self._cfull) were
+computed from the current x and y coefficients"""
+
+        return self._dckey == self.coeffskey()
         
     def initjacpoly(self):
 
         """Initializes the jacobian for the polynomial using the
 characteristics of the data, to the identity, [N,2,2] """
 
-        nobjs = np.size(self.x)
+        nobjs = self._nx
         if nobjs < 1:
             self.jacpoly = np.array([])
             return
         
-        self.jacpoly = np.zeros(( nobjs, 2, 2 ))
+        self.jacpoly = np.zeros(( nobjs, 2, 2 ), dtype=self.dtype)
         self.jacpoly[:,0,0] = 1.
         self.jacpoly[:,1,1] = 1.
         
@@ -931,16 +2022,46 @@ polynomial"""
 
         # We assume the jacobian has already been initialized. If not,
         # return.
-        if np.size(self.jacpoly) < 2:
+        if self.jacpoly.size < 2:
             if self.Verbose:
                 print("Poly.populatejacpoly WARN - jacobian < 2 elements. Not initialized yet?")
             return
 
-        # Compute the coefficients... 
-        self.setderivcoeffs()
-
-        # ... and evaluate them at the datapoints
+        # If neither the coefficients nor the positions have changed
+        # since we last evaluated, there is nothing to do
+        if self.jacpolyfresh():
+            return
+        self._jpkey = None
+        
+        # Compute the coefficients, unless they are already current
+        # (updatetransf() sets them before calling us)...
+        if not self.derivsfresh():
+            self.setderivcoeffs()
+
+        # ... and evaluate them at the datapoints, using the basis
+        # tables if we have them
+        if np.ndim(self.cstack) > 2:
+            if not self.tablesok(self.cstack.shape[1]):
+                self.setbasistables()
+
+            if self.tablesok(self.cstack.shape[1]):
+
+                # If the coefficients for the positions have the same
+                # shape as their derivatives, and the tables are for
+                # the current positions, evaluate all six together
+                if self.posfresh() \
+                   and np.shape(self.pars2x.p2d) == self.cstack.shape[1::] \
+                   and np.shape(self.pars2y.p2d) == self.cstack.shape[1::]:
+                    self.evalposjac()
+                    self.setjacpolykey()
+                    return
+                
+                self.jacpoly = self.jacpolyfromtables(self._XP, self._YP)
+                self.setjacpolykey()
+                return
+            
         self.jacpoly = self.evaluatejacpoly(self.xr, self.yr)
+        self.setjacpolykey()
 
         # this is if we already have an instance-level we want to fill in
         #self.jacpoly[:,0,0] = self.methval2d(self.xr, self.yr, self.cxx)
@@ -948,6 +2069,24 @@ polynomial"""
         #self.jacpoly[:,1,0] = self.methval2d(self.xr, self.yr, self.cyx)
         #self.jacpoly[:,1,1] = self.methval2d(self.xr, self.yr, self.cyy)
 
+    def setjacpolykey(self):
+
+        """Records the coefficients and rescaled positions the polynomial
+jacobian was just evaluated for"""
+
+        self._jpkey = self.coeffskey()
+        self._jpsrc = (self.xr, self.yr, self.jacpoly)
+
+    def jacpolyfresh(self):
+
+        """Returns True if the polynomial jacobian was evaluated for the
+current coefficients and rescaled positions"""
+
+        return self._jpkey is not None \
+            and self._jpkey == self.coeffskey() \
+            and self._jpsrc[0] is self.xr and self._jpsrc[1] is self.yr \
+            and self._jpsrc[2] is self.jacpoly
+
     def evaluatejacpoly(self, xr=np.array([]), yr=np.array([]) ):
 
         """Evaluates the jacobian corresponding to the [-1,1] x, y"""
@@ -955,13 +2094,56 @@ polynomial"""
         if np.size(xr) < 1 or np.size(yr) < 1:
             return np.array([])
 
-        jacpoly = np.zeros(( xr.size, 2, 2 ))
-        jacpoly[:,0,0] = self.methval2d(xr, yr, self.cxx)
-        jacpoly[:,0,1] = self.methval2d(xr, yr, self.cxy)
-        jacpoly[:,1,0] = self.methval2d(xr, yr, self.cyx)
-        jacpoly[:,1,1] = self.methval2d(xr, yr, self.cyy)
+        if np.ndim(self.cstack) < 3:
+            jacpoly = np.zeros(( xr.size, 2, 2 ), dtype=self.dtype)
+            jacpoly[:,0,0] = self.methval2d(xr, yr, self.cxx)
+            jacpoly[:,0,1] = self.methval2d(xr, yr, self.cxy)
+            jacpoly[:,1,0] = self.methval2d(xr, yr, self.cyx)
+            jacpoly[:,1,1] = self.methval2d(xr, yr, self.cyy)
 
-        return jacpoly
+            return jacpoly
+
+        # All four derivatives are evaluated at the same points, so
+        # we build the 1D basis tables once and contract them against
+        # all four coefficient sets together.
+        XP = self.methvander(xr, self.cstack.shape[1]-1)
+        YP = self.methvander(yr, self.cstack.shape[2]-1)
+
+        return self.jacpolyfromtables(XP, YP)
+
+    def evalposjac(self):
+
+        """Evaluates the transformed positions and the [N,2,2] polynomial
+jacobian at the rescaled positions in a single contraction against the
+basis tables. The positions are kept for the next call to tranpos(),
+which uses them once.
+Assumes the tables and the derivative coefficients are already set."""
+
+        # [6, N]: xtran, ytran, then the four jacobian terms, each
+        # contiguous. The coefficients are usually already laid out
+        # together.
+        if np.ndim(self._cfull) == 3 and self.derivsfresh():
+            cfull = self._cfull
+        else:
+            cfull = np.concatenate(( self.poscoeffs(), self.cstack ))
+        vals = self.evalstack(self._XP, self._YP, cfull)
+
+        self._xtranr = vals[0]
+        self._ytranr = vals[1]
+        self.jacpoly = np.moveaxis(vals[2::].reshape(2, 2, -1), \
+                                   (0,1), (-2,-1))
+        self._tranfresh = True
+        
+    def jacpolyfromtables(self, XP=np.array([]), YP=np.array([]) ):
+
+        """Evaluates the [N,2,2] polynomial jacobian from 1D basis tables XP,
+YP, which may extend to higher degree than the derivative coefficients"""
+
+        # Evaluated as [4, N] so that the components are contiguous
+        # (as with _empty22)
+        jacflat = self.evalstack(XP, YP, self.cstack)
+
+        return np.moveaxis(jacflat.reshape(2, 2, -1), (0,1), (-2,-1))
         
     def combinejac(self):
 
@@ -969,21 +2151,29 @@ polynomial"""
 a single jacobian"""
 
         # 2024-09-04 return gracefully if either array is empty
-        if np.size(self.jacrescale) < 1:
+        if self.jacrescale.size < 1:
+            return
+        
+        if self.jacpoly.size < 1:
             return
         
-        if np.size(self.jacpoly) < 1:
+        # Nothing to do if neither has changed since last time
+        if self._jacsrc[0] is self.jacrescale \
+           and self._jacsrc[1] is self.jacpoly:
             return
         
-        # numpy's matmul handles broadcasting for us. 
-        self.jac = np.matmul( self.jacrescale, self.jacpoly )
+        # The rescaling jacobian is a single 2x2, which _mul22
+        # broadcasts across the polynomial jacobians. (self.jac is
+        # handed out to callers, so we don't write into the old one.)
+        self.jac = _mul22( self.jacrescale, self.jacpoly )
+        self._jacsrc = (self.jacrescale, self.jacpoly)
 
     def getjacobian(self):
 
         """One-liner to get the jacobians for the rescaling and polynomial"""
 
         self.setjacrescale()
-        if np.size(self.jacpoly) < 2:
+        if self.jacpoly.size < 2:
             self.initjacpoly()
             
         self.populatejacpoly()
@@ -991,7 +2181,7 @@ a single jacobian"""
 
     def updatedata(self, x=np.array([]), y=np.array([]), \
                    covxy=np.array([]), \
-                   xy=np.array([]) ):
+                   xy=np.array([]), copy=True):
 
         """Ingests supplied data to populate x, y, covars. 
 
@@ -1006,31 +2196,41 @@ Inputs:
 
         xy = [N,2] xy array. If set, supersedes x, y.
 
+        copy = copy the inputs (default). If False, contiguous inputs
+        are used as-is, so the instance shares them with the caller
+        and nudgepos() will move the caller's positions too. The
+        columns of xy are strided, so are copied either way.
+
 Outputs:
         None - internal attributes self.x, self.y, self.covxy
 
 """
 
-        # Positions
+        # Positions. The columns of an [N,2] array are strided views,
+        # so we ensure we are working with contiguous arrays.
         if np.ndim(xy) == 2:
-            self.x = xy[:,0]
-            self.y = xy[:,1]
+            self.x = _ingestarray(xy[:,0], copy, self.dtype)
+            self.y = _ingestarray(xy[:,1], copy, self.dtype)
         else:
-            self.x = np.copy(x)
-            self.y = np.copy(y)
+            self.x = _ingestarray(x, copy, self.dtype)
+            self.y = _ingestarray(y, copy, self.dtype)
+
+        self._nx = self.x.shape[0] if self.x.ndim else 0
+
+        # New data: the rescaled positions no longer apply
+        self._xrsrc = None
+        self._yrsrc = None
+        self._posgen += 1
             
         # covariances. We parse here for matching size with the
         # positions before updating
         if np.ndim(covxy) != 3:
             return
 
-        ndata = np.size(self.x)
-        ncov = np.shape(covxy)[0]
-
-        if ndata != ncov:
+        if self._nx != covxy.shape[0]:
             return
 
-        self.covxy = np.copy(covxy)
+        self.covxy = _ingestarray(covxy, copy, self.dtype)
 
     def updatejacobian(self):
 
@@ -1046,7 +2246,7 @@ Outputs:
         self.initxytran()
         
     def ingestdata(self, x=np.array([]), y=np.array([]), covxy=np.array([]), \
-               xy=np.array([]) ):
+               xy=np.array([]), copy=True):
 
         """Ingests supplied data to populate x, y, covars, and updates the rescaling and the jacobians accordingly.
 
@@ -1061,10 +2261,12 @@ Inputs:
 
         xy = [N,2] xy array. If set, supersedes x, y.
 
+        copy = copy the inputs (see updatedata())
+
         """
 
         # First, update the data
-        self.updatedata(x, y, covxy, xy)
+        self.updatedata(x, y, covxy, xy, copy=copy)
 
         # then the jacobians and other attributes that need to change
         self.updatejacobian()
@@ -1074,30 +2276,59 @@ Inputs:
         """Transforms the covariances from the unrescaled originals to the
 target frame. Updates self.covtran in the instance."""
 
-        if np.size(self.jac) < 2:
+        if self.jac.size < 2:
             self.getjacobian()
 
-        if np.size(self.covxy) < 2:
+        if self.covxy.size < 2:
             if self.Verbose:
                 print("Poly.trancov WARN - self.covxy size < 2")
                 return
             return
 
+        # Zero covariances (e.g. when fitting the positions only)
+        # propagate to zero, so there is nothing to evaluate
+        covp = _packedcovs(self.covxy)
+        if covp is None:
+            shp = np.broadcast_shapes(np.shape(self.x), \
+                                      np.shape(self.covxy)[:-2])
+            self.covtran = _zeros22(shp, self.dtype)
+            return
+
+        # If the jacobian was computed at the current positions, use
+        # it rather than re-evaluating it (as propagate_cov()).
+        if self.posfresh() and np.shape(self.jac) == np.shape(self.covxy):
+            self.covtran = _propcov_22(self.jac, covp)
+            return
+        
         self.covtran = self.propcov(self.covxy, self.x, self.y)
+
+    def propagate_cov(self):
+
+        """Propagates the instance covariances through the instance jacobian
+as J.C.J^T, updating self.covtran. Assumes self.jac is already
+evaluated at the instance positions."""
+
+        self.covtran = _propcov_22(self.jac, _pack22(self.covxy))
         
     def propcov(self, C=np.array([]), x=np.array([]), y=np.array([]) ):
 
         """Propagates unrescaled covariances from input to output frame, returning the transformed covariances as an [N,2,2] array."""
 
+        # Zero covariances (e.g. when fitting the positions only)
+        # propagate to zero, so the jacobian need not be evaluated
+        if np.size(C) < 1:
+            return np.array([])
+
+        if not np.any(C):
+            shp = np.broadcast_shapes(np.shape(x), np.shape(C)[:-2])
+            return _zeros22(shp, np.result_type(C, self.dtype))
+
         # First compute the jacobian
         xr, yr = self.rescalexy(x,y)
         Jpoly = self.evaluatejacpoly(xr, yr)
-        J = np.matmul( self.jacrescale, Jpoly )
+        J = _mul22( self.jacrescale, Jpoly )
         
-        # J = self.jac
-        Jt = np.transpose(J,axes=(0,2,1))
-
-        return np.matmul(J, np.matmul(C, Jt) )
+        return _propcov_22(J, C)
         
 
     def nudgepos(self, dxarcsec=10., dyarcsec=10.):
@@ -1109,15 +2340,23 @@ target frame. Updates self.covtran in the instance."""
         if self.degrees:
             conv = 3600.
 
-        self.x += dxarcsec / conv
-        self.y += dyarcsec / conv
+        # in-place, so that views of the positions held elsewhere
+        # see the nudge
+        np.add(self.x, dxarcsec / conv, out=self.x)
+        np.add(self.y, dyarcsec / conv, out=self.y)
+
+        # The positions were changed in-place, so the rescaled
+        # positions no longer correspond to them.
+        self._xrsrc = None
+        self._yrsrc = None
+        self._posgen += 1
             
-    def calcdeltas(self, dxarcsec=10., dyarcsec=10.):
+    def calcdeltas(self, dxarcsec=10., dyarcsec=10., out=None):
 
         """Utility - given the jacobian for the transformation, compute the
-deltas from J.dx"""
+deltas from J.dx. If supplied, the [N,2] deltas are written into out."""
 
-        if np.size(self.jac) < 1:
+        if self.jac.size < 1:
             return np.array([])
 
         # delta-array will be in the same units as the original
@@ -1127,8 +2366,7 @@ deltas from J.dx"""
         if self.degrees:
             conv = 3600.
 
-        dx = np.array([dxarcsec, dyarcsec])/conv
-        dv = np.matmul(self.jac, dx)
+        dv = _mul22vec(self.jac, dxarcsec/conv, dyarcsec/conv, out=out)
 
         return dv
             
@@ -1165,10 +2403,23 @@ frame"""
 
         """
 
-        self.xmin = np.copy(xmin)
-        self.xmax = np.copy(xmax)
-        self.ymin = np.copy(ymin)
-        self.ymax = np.copy(ymax)
+        self.xmin = _copylimit(xmin)
+        self.xmax = _copylimit(xmax)
+        self.ymin = _copylimit(ymin)
+        self.ymax = _copylimit(ymax)
+
+        # Positions rescaled with the previous limits (and positions
+        # transformed through them) are now stale
+        self._xrsrc = None
+        self._yrsrc = None
+        self._posgen += 1
+
+        # Update the rescaling coefficients if we can. (The rescaling
+        # jacobian is updated along with the jacobian, in
+        # getjacobian().)
+        if not any(lim is None for lim in \
+                   (self.xmin, self.xmax, self.ymin, self.ymax)):
+            self.setrescale()
         
     def updatetransf(self, pars=np.array([]) ):
 
@@ -1193,8 +2444,12 @@ parameters. Anticipating the eventual use-case, the x and y parameters are assum
         self.pars2x.updatecoeffs(parsx)
         self.pars2y.updatecoeffs(parsy)
 
-        # ... the derivative coefficients...
-        self.setderivcoeffs()
+        # ... the derivative coefficients. If the coefficients did
+        # not actually change (e.g. a rejected MCMC proposal), the
+        # transformed positions and the jacobians are still good.
+        if not self.derivsfresh():
+            self._tranfresh = False
+            self.setderivcoeffs()
         
         # ... and the jacobian
         self.populatejacpoly()
@@ -1222,20 +2477,48 @@ Inputs:
         
         return labelsx + labelsy
         
+# Maximum order supported by Polynom, the number of terms up to each
+# order, and the powers of x and y for each term in Polynom's
+# coefficient ordering
+_POLYNOM_MAXDEG = 5
+_POLYNOM_NTERMS = tuple( (k+1)*(k+2)//2 for k in range(_POLYNOM_MAXDEG+1) )
+_POLYNOM_IPOW = tuple( k-j for k in range(_POLYNOM_MAXDEG+1) \
+                       for j in range(k+1) )
+_POLYNOM_JPOW = tuple( j for k in range(_POLYNOM_MAXDEG+1) \
+                       for j in range(k+1) )
+
 class Polynom(object):
 
     """Methods to transform positions and uncertainties via
 polynomial. Note this is not invertible, so we only provide methods in
-the one direction."""
+the one direction. dtype sets the floating point type for the
+positions, jacobian and covariances (the parameters are cast to it
+when evaluated)."""
 
     def __init__(self, posxy=np.array([]), covxy=np.array([]), \
                  parsx=np.array([]), parsy=np.array([]), \
-                 degrees=True):
+                 degrees=True, dtype=np.float64):
 
-        self.x = posxy[:,0]
-        self.y = posxy[:,1]
+        # (views of posxy unless a cast is needed)
+        self.dtype = np.dtype(dtype)
+        self.x = np.asarray(posxy[:,0], dtype=self.dtype)
+        self.y = np.asarray(posxy[:,1], dtype=self.dtype)
 
-        self.covxy = covxy
+        # Powers of x, y used to evaluate the polynomials and their
+        # derivatives, and a copy of the (x, y) they were computed
+        # from. Set by powertables().
+        self._xpow = []
+        self._ypow = []
+        self._powsrc = (None, None)
+
+        # [K, N] table of the monomials, [2, K, N] table of their x-
+        # and y-derivatives, and the power tables they were built
+        # from. Set by monomials().
+        self._monos = np.array([])
+        self._dmonos = np.array([])
+        self._monosrc = None
+
+        self.covxy = np.asarray(covxy, dtype=self.dtype)
 
         # transformation parameters for x, y coords
         self.parsx = parsx
@@ -1250,7 +2533,7 @@ the one direction."""
         self.covtran = np.array([])
 
         # calling routines may want transformed coords in [N,2] format
-        self.xytran = np.zeros(( np.size(self.x), 2))
+        self.xytran = np.zeros(( np.size(self.x), 2), dtype=self.dtype)
         
         # control variable - original coords are in degrees?
         self.degrees = degrees
@@ -1259,55 +2542,118 @@ the one direction."""
         self.labelxtran = r'$X$'
         self.labelytran = r'$Y$'
 
+    def powertables(self, deg=5):
+
+        """Returns lists of the powers [1, x, x**2, ...] and [1, y, y**2,
+...] of the instance coordinates, up to power deg. The tables are
+built once and re-used until the coordinates change."""
+
+        # Rebuild if the coordinates have changed or if we need higher
+        # powers than we have. The coordinates are usually views of
+        # the caller's posxy, which can be changed in place, so we
+        # compare by value against the copy the tables were built from
+        # (which is also the first power).
+        xsrc, ysrc = self._powsrc
+        if xsrc is None or ysrc is None or len(self._xpow) < deg+1 \
+           or not np.array_equal(self.x, xsrc, equal_nan=True) \
+           or not np.array_equal(self.y, ysrc, equal_nan=True):
+            xsrc = np.copy(self.x)
+            ysrc = np.copy(self.y)
+            self._xpow = [np.ones(np.shape(xsrc), dtype=xsrc.dtype), xsrc]
+            self._ypow = [np.ones(np.shape(ysrc), dtype=ysrc.dtype), ysrc]
+            for k in range(2, deg+1):
+                self._xpow.append(self._xpow[-1] * xsrc)
+                self._ypow.append(self._ypow[-1] * ysrc)
+            self._powsrc = (xsrc, ysrc)
+
+        return self._xpow, self._ypow
+
+    def monomials(self, deg=5):
+
+        """Returns the [K, N] table of the monomials x**i y**j for the K
+terms up to order deg (in the coefficient ordering of polyval2d), and
+the [2, K, N] table of their derivatives with respect to x and y. Built
+from the power tables and re-used until those change."""
+
+        xpow, ypow = self.powertables(deg)
+        nterms = _POLYNOM_NTERMS[deg]
+
+        if self._monosrc is not xpow or self._monos.shape[0] < nterms:
+            shp = np.shape(self.x)
+            dtype = np.result_type(xpow[0], ypow[0])
+            zero = np.zeros(shp, dtype=dtype)
+            self._monos = np.empty((nterms,) + shp, dtype=dtype)
+            self._dmonos = np.empty((2, nterms) + shp, dtype=dtype)
+            for l in range(nterms):
+                i, j = _POLYNOM_IPOW[l], _POLYNOM_JPOW[l]
+                np.multiply(xpow[i], ypow[j], out=self._monos[l])
+
+                # d/dx (x**i y**j) = i x**(i-1) y**j and similarly for y
+                if i > 0:
+                    np.multiply(xpow[i-1], ypow[j], out=self._dmonos[0,l])
+                    self._dmonos[0,l] *= i
+                else:
+                    self._dmonos[0,l] = zero
+                if j > 0:
+                    np.multiply(xpow[i], ypow[j-1], out=self._dmonos[1,l])
+                    self._dmonos[1,l] *= j
+                else:
+                    self._dmonos[1,l] = zero
+            self._monosrc = xpow
+
+        return self._monos[0:nterms], self._dmonos[:,0:nterms]
+
+    def stackpars(self):
+
+        """Returns the x and y parameters as a [K, 2] coefficient matrix
+over the K terms of the higher of their two orders, with terms beyond
+each one's own (complete) order set to zero, and that order."""
+
+        degx = self.degfrompars(self.parsx)
+        degy = self.degfrompars(self.parsy)
+        deg = max(degx, degy)
+
+        P = np.zeros(( _POLYNOM_NTERMS[deg], 2 ), dtype=self.dtype)
+        P[0:_POLYNOM_NTERMS[degx],0] = self.parsx[0:_POLYNOM_NTERMS[degx]]
+        P[0:_POLYNOM_NTERMS[degy],1] = self.parsy[0:_POLYNOM_NTERMS[degy]]
+
+        return P, deg
+    
+    def degfrompars(self, pars=np.array([]) ):
+
+        """Returns the highest order (up to fifth) for which all the terms
+are present in the 1D parameters"""
+
+        npars = np.size(pars)
+        deg = 0
+        for k in range(1, _POLYNOM_MAXDEG+1):
+            if npars < _POLYNOM_NTERMS[k]:
+                break
+            deg = k
+
+        return deg
+        
     def polyval2d(self, pars=np.array([])):
 
         """Evaluates the polynomial for the instance-level coordinates"""
 
-        # This is written out by hand for readability and for ease
-        # translating to the jacobians later on. Might be better to
-        # use rules to construct all the powers, but that requires
-        # cleverer list comprehension chops than I currently have.
-        
-        # This really serves to establish our convention for the
-        # coefficients throughout this object.
-        z = self.x * 0. + pars[0] # inherit the shape of x
-        if np.size(pars) < 2: # want this to work on scalar pars
-            return z
-
-        # add linear terms...
-        z += self.x * pars[1] + self.y * pars[2]
-        if np.size(pars) < 6:
-            return z
-
-        # second-order...
-        z += self.x**2 * pars[3] + self.x*self.y*pars[4] + self.y**2 * pars[5]
-        if np.size(pars) < 10:
-            return z
-
-        # third order...
-        z += self.x**3 * pars[6] + \
-            self.x**2 * self.y    * pars[7] + \
-            self.x    * self.y**2 * pars[8] + \
-            self.y**3 * pars[9]
-        if np.size(pars) < 15:
-            return z
-        
-        # fourth order...
-        z += self.x**4            * pars[10] + \
-            self.x**3 * self.y    * pars[11] + \
-            self.x**2 * self.y**2 * pars[12] + \
-            self.x    * self.y**3 * pars[13] + \
-                        self.y**4 * pars[14]
-        if np.size(pars) < 21:
-            return z
-        
-        # fifth-order
-        z += self.x**5 * pars[15] + \
-            self.x**4 * self.y    * pars[16] + \
-            self.x**3 * self.y**2 * pars[17] + \
-            self.x**2 * self.y**3 * pars[18] + \
-            self.x * self.y**4 * pars[19] + \
-            self.y**5 * pars[20]
+        # Our convention for the coefficients throughout this object:
+        # terms are ordered by total power, and by increasing power of
+        # y within each total power, i.e.
+        #
+        # pars[0] + pars[1]*x + pars[2]*y + pars[3]*x**2 +
+        # pars[4]*x*y + pars[5]*y**2 + pars[6]*x**3 + ...
+        #
+        # up to fifth order. Terms of an incomplete order are
+        # ignored.
+        #
+        # The exponents (i, j) of each term come from the module
+        # tables, and the monomials x**i y**j are cached per
+        # instance, so any order is a single contraction.
+        deg = self.degfrompars(pars)
+        monos, _ = self.monomials(deg)
+        c = np.asarray(pars[0:_POLYNOM_NTERMS[deg]], dtype=monos.dtype)
+        z = np.tensordot(c, monos, axes=(0,0))
 
         return z
         
@@ -1321,67 +2667,12 @@ x,y)). Coordinates are taken from the instance, pars are passed in as
 arguments
         """
 
-        #dz/dx, dz/dy
-        zx = self.x * 0.
-        zy = self.y * 0.
-
-        if np.size(pars) < 2:
-            return zx, zy
-
-        # first order
-        zx += self.x * 0. + pars[1]
-        zy += self.y * 0. + pars[2]
-        if np.size(pars) < 6:
-            return zx, zy
-
-        # second order - now the coordinates finally get involved
-        zx += 2.0*self.x * pars[3] + self.y*pars[4]
-        zy += 2.0*self.y * pars[5] + self.x*pars[4]
-        if np.size(pars) < 10:
-            return zx, zy
-
-        # third order
-        zx += \
-            3.0*self.x**2 * pars[6] + \
-            2.0*self.x*self.y*pars[7] + \
-            self.y**2 * pars[8]
-
-        zy += \
-            self.x**2 * pars[7] + \
-            2.0*self.y * self.x * pars[8] + \
-            3.0*self.y**2 * pars[9]
-        if np.size(pars) < 15:
-            return zx, zy
-
-        # fourth order
-        zx += \
-            4.0*self.x**3 * pars[10] + \
-            3.0*self.x**2 * self.y * pars[11] + \
-            2.0*self.x * self.y**2 * pars[12] + \
-            self.y**3 * pars[13]
-
-        zy += \
-            self.x**3 * pars[11] + \
-            2.0 * self.y * self.x**2 * pars[12] + \
-            3.0 * self.y**2 * self.x * pars[13] + \
-            4.0 * self.y**3 * pars[14]
-        if np.size(pars) < 21:
-            return zx, zy
-
-        # fifth-order
-        zx += \
-            5.0*self.x**4 * pars[15] + \
-            4.0*self.x**3 * self.y * pars[16] + \
-            3.0*self.x**2 * self.y**2 * pars[17] + \
-            2.0*self.x    * self.y**3 * pars[18] +\
-            self.y**4 * pars[19]
-
-        zy += \
-            self.x**4 * pars[16] + \
-            2.0*self.y    * self.x**3 * pars[17] + \
-            3.0*self.y**2 * self.x**2 * pars[18] + \
-            4.0*self.y**3 * self.x    * pars[19] + \
-            5.0*self.y**4 * pars[20]
+        # Same tables as polyval2d, using the derivative monomials
+        # d/dx (x**i y**j) = i x**(i-1) y**j and similarly for y
+        deg = self.degfrompars(pars)
+        _, dmonos = self.monomials(deg)
+        c = np.asarray(pars[0:_POLYNOM_NTERMS[deg]], dtype=dmonos.dtype)
+        zx, zy = np.tensordot(c, dmonos, axes=(0,1))
 
         # fifth-order is probably enough for now!
         return zx, zy
@@ -1390,36 +2681,42 @@ arguments
 
         """Transforms the positions by the polyomials"""
 
-        self.xtran = self.polyval2d(self.parsx)
-        self.ytran = self.polyval2d(self.parsy)
+        # Both outputs use the same monomials, so we evaluate them
+        # together as a single [2, K] x [K, N] product. (polyval2d()
+        # does the same for one set of parameters at a time.)
+        P, deg = self.stackpars()
+        monos, _ = self.monomials(deg)
+        
+        self.xtran, self.ytran = np.tensordot(P, monos, axes=(0,0))
 
     def getjacobian(self):
 
         """Populates the jacobian associated with the polynomial
 transformations"""
 
-        self.jac = np.zeros(( np.size(self.x), 2, 2 ))
-
-        jxix, jxiy = self.jac2d(self.parsx)
-        jetax, jetay = self.jac2d(self.parsy)
+        # All four terms at once from the derivative monomials: the
+        # product is ordered [output, derivative, N], which we view
+        # as [N, 2, 2] with each component contiguous (as _empty22).
+        P, deg = self.stackpars()
+        _, dmonos = self.monomials(deg)
 
-        self.jac[:,0,0] = jxix
-        self.jac[:,0,1] = jxiy
-        self.jac[:,1,0] = jetax
-        self.jac[:,1,1] = jetay
+        jacflat = np.tensordot(P, dmonos, axes=(0,1))
+        self.jac = np.moveaxis(jacflat, (0,1), (-2,-1))
 
     def trancov(self):
 
         """Transforms the covariance via the jacobian"""
 
+        # Zero covariances propagate to zero
+        covp = _packedcovs(self.covxy)
+        if covp is None:
+            self.covtran = _zeros22(np.shape(self.covxy)[:-2], self.dtype)
+            return
+        
         if np.size(self.jac) < 1:
             self.getjacobian()
 
-        J = self.jac
-        Jt = np.transpose(J, axes=(0,2,1))
-        C = self.covxy
-
-        self.covtran = np.matmul(J, np.matmul(C, Jt) )
+        self.covtran = _propcov_22(self.jac, covp)
 
     def propagate(self):
 
@@ -1448,12 +2745,19 @@ transformations"""
         if self.degrees:
             conv = 3600.
 
-        self.x += dxarcsec / conv
-        self.y += dyarcsec / conv
+        # in-place, so that views of the positions held elsewhere
+        # see the nudge
+        np.add(self.x, dxarcsec / conv, out=self.x)
+        np.add(self.y, dyarcsec / conv, out=self.y)
+
+        # The positions were changed in-place, so the power tables
+        # need rebuilding
+        self._powsrc = (None, None)
             
-    def calcdeltas(self, dxarcsec=10., dyarcsec=10.):
+    def calcdeltas(self, dxarcsec=10., dyarcsec=10., out=None):
 
-        """Estimates deltas in the projected frame from Jacobian.dx"""
+        """Estimates deltas in the projected frame from Jacobian.dx. If
+supplied, the [N,2] deltas are written into out."""
 
         if np.size(self.jac) < 4:
             return np.array([])
@@ -1464,8 +2768,7 @@ transformations"""
         if self.degrees:
             conv = 3600.
             
-        dx = np.array([dxarcsec, dyarcsec])/conv
-        dv = np.matmul(self.jac, dx)
+        dv = _mul22vec(self.jac, dxarcsec/conv, dyarcsec/conv, out=out)
         
         return dv
 
@@ -1478,6 +2781,11 @@ from the tangent plane to the sky.
     covradec are for compatibility with other calls, and are currently
     ignored.)
 
+    dtype sets the floating point type for the positions, jacobian
+    and covariances (e.g. np.float32 for large Monte Carlo sets). The
+    angle conversion and tangent point trig are kept as Python floats
+    so that they don't promote float32 arrays back to float64.
+
     """
 
     # Convention: x, y => xi, eta
@@ -1488,11 +2796,17 @@ from the tangent plane to the sky.
                  Verbose=True,
                  kindpoly=None, checkparsy=False, \
                  xmin=None, xmax=None, ymin=None, ymax=None, \
-                 radec=None, covradec=None):
+                 radec=None, covradec=None, dtype=np.float64):
 
-        self.x = xi
-        self.y = eta
-        self.covxy = covxieta
+        self.dtype = np.dtype(dtype)
+        self.x = np.asarray(xi, dtype=self.dtype)
+        self.y = np.asarray(eta, dtype=self.dtype)
+        self.covxy = np.asarray(covxieta, dtype=self.dtype)
+
+        # Counts changes made to the input positions through this
+        # object (new data, nudges), so that objects chaining this one
+        # can tell when their propagated positions are out of date.
+        self._posgen = 0
         
         self.pars = pars # the tangent point
 
@@ -1508,6 +2822,22 @@ from the tangent plane to the sky.
         self.degrees = degrees
         self.conv2rad = 1.
         self.setconversion()
+
+        # Tangent point in radians and the trig of its declination,
+        # and the (pars, conv2rad) they were computed from. Set by
+        # tpointtrig().
+        self._tptrig = ()
+        self._tpkey = None
+
+        # Scratch buffer for the jacobian at the instance positions,
+        # re-used by trancov() while the number of points stays the
+        # same. (covtran itself is handed out to callers, so is
+        # allocated fresh each time.)
+        self._jacbuf = None
+
+        # Scratch space for the intermediates of the projection
+        # kernels, likewise re-used (see _reusework)
+        self._workbuf = None
         
         # jacobian for transforming uncertainty
         self.jac=np.eye(2)
@@ -1533,7 +2863,7 @@ from the tangent plane to the sky.
 
     def updatedata(self, x=np.array([]), y=np.array([]), \
                    covxy=np.array([]), \
-                   xy=np.array([]) ):
+                   xy=np.array([]), copy=True):
 
         """Ingests supplied data to populate x, y, covars. 
 
@@ -1548,6 +2878,9 @@ Inputs:
 
         xy = [N,2] xy array. If set, supersedes x, y.
 
+        copy = copy the inputs (default). If False, contiguous inputs
+        are used as-is, so the instance shares them with the caller.
+
         
         Outputs:
         None - internal attributes self.x, self.y, self.covxy
@@ -1556,11 +2889,12 @@ Inputs:
 
         # Positions
         if np.ndim(xy) == 2:
-            self.x = xy[:,0]
-            self.y = xy[:,1]
+            self.x = _ingestarray(xy[:,0], copy, self.dtype)
+            self.y = _ingestarray(xy[:,1], copy, self.dtype)
         else:
-            self.x = np.copy(x)
-            self.y = np.copy(y)
+            self.x = _ingestarray(x, copy, self.dtype)
+            self.y = _ingestarray(y, copy, self.dtype)
+        self._posgen += 1
             
         # covariances. We parse here for matching size with the
         # positions before updating
@@ -1573,7 +2907,7 @@ Inputs:
         if ndata != ncov:
             return
 
-        self.covxy = np.copy(covxy)
+        self.covxy = _ingestarray(covxy, copy, self.dtype)
 
     def updatejacobian(self):
 
@@ -1588,7 +2922,7 @@ Inputs:
         """Initializes convenience-view xytran [N,2] using dimensions of input
 data x"""
 
-        self.xytran = np.zeros(( np.size(self.x), 2 ))
+        self.xytran = np.zeros(( np.size(self.x), 2 ), dtype=self.dtype)
         
     def initjac(self):
 
@@ -1598,10 +2932,10 @@ data x"""
         if npoints < 1:
             if self.Verbose:
                 print("Tan2equ WARN - no datapoints. Initializing jacobian to identity")
-            self.jac = np.eye(2)
+            self.jac = np.eye(2, dtype=self.dtype)
             return
         
-        self.jac = np.zeros(( npoints, 2, 2 ))
+        self.jac = np.zeros(( npoints, 2, 2 ), dtype=self.dtype)
         self.jac[:,0,0] = 1.
         self.jac[:,1,1] = 1.
         
@@ -1613,16 +2947,50 @@ data x"""
         if self.degrees:
             self.conv2rad = np.pi/180.
 
+    def convarcsec(self):
+
+        """Returns the number of arcseconds per unit of the instance's
+angles. Read from self.degrees on each call, so that a change to it
+is picked up."""
+
+        if self.degrees:
+            return 3600.
+
+        return 206265.
+
+    def torad(self, x=np.array([]) ):
+
+        """Returns input angles in radians. If the instance already works in
+radians, the input is passed through without the (unit) multiply."""
+
+        if self.conv2rad == 1.:
+            return np.asarray(x)
+
+        return x * self.conv2rad
+
+    def fromrad(self, x=np.array([]), inplace=False):
+
+        """Converts angles in radians back to the instance's convention. If
+inplace, x is overwritten (for arrays that the calling method owns)."""
+
+        if self.conv2rad == 1.:
+            return x
+
+        if inplace:
+            return np.divide(x, self.conv2rad, out=x)
+        
+        return x / self.conv2rad
+
     def updatelimits(self, xmin=None, xmax=None, ymin=None, ymax=None):
 
         """Updates xmin, xmax, etc. attributes"""
 
         # For this object, is used mainly for compatibility
         
-        self.xmin = np.copy(xmin)
-        self.xmax = np.copy(xmax)
-        self.ymin = np.copy(ymin)
-        self.ymax = np.copy(ymax)
+        self.xmin = _copylimit(xmin)
+        self.xmax = _copylimit(xmax)
+        self.ymin = _copylimit(ymin)
+        self.ymax = _copylimit(ymax)
         
     def setjacobian(self):
 
@@ -1630,7 +2998,51 @@ data x"""
 
         self.jac = self.evaluatejac(self.x, self.y)
 
-    def evaluatejac(self, x=np.array([]), y=np.array([]) ):
+    def tpointtrig(self):
+
+        """Returns the tangent point (alpha0, delta0) in radians, and
+cos(delta0), sin(delta0). These are recomputed only when the tangent
+point (or the angle convention) changes."""
+
+        # The tangent point is sometimes set directly by the calling
+        # routine, so we check the values rather than relying on
+        # updatetransf() being called.
+        key = (float(self.pars[0]), float(self.pars[1]), self.conv2rad)
+        if key != self._tpkey:
+            alpha0 = key[0] * self.conv2rad
+            delta0 = key[1] * self.conv2rad
+            self._tptrig = (alpha0, delta0, \
+                            math.cos(delta0), math.sin(delta0))
+            self._tpkey = key
+
+        return self._tptrig
+
+    def _eval_tan2equ_core(self, x=np.array([]), y=np.array([]) ):
+
+        """Returns the input x, y in radians (xi, eta), and gamma = cos(delta0)
+- eta sin(delta0), which the positions and the jacobian both use"""
+
+        cosd0, sind0 = self.tpointtrig()[2:4]
+
+        xi  = self.torad(x)
+        eta = self.torad(y)
+        gamma = cosd0 - eta*sind0
+
+        return xi, eta, gamma
+
+    def workbuf(self, x=np.array([]), y=np.array([]) ):
+
+        """Returns the instance scratch space for the projection kernels at
+x, y (see _reusework), re-allocating it only if their shape or type
+has changed"""
+
+        shp = np.broadcast_shapes(np.shape(x), np.shape(y))
+        dtype = np.result_type(x, y, 1.0)
+        self._workbuf = _reusework(self._workbuf, 6, shp, dtype)
+
+        return self._workbuf
+
+    def evaluatejac(self, x=np.array([]), y=np.array([]), out=None):
 
         """Computes the jacobian for input x, y"""
 
@@ -1640,42 +3052,16 @@ data x"""
         # comparison on number of planes between data and jacobian
         # might come here.
         
-        # Ensure input angles are in radians
-        xi  = x * self.conv2rad
-        eta = y * self.conv2rad
-        alpha0 = self.pars[0] * self.conv2rad
-        delta0 = self.pars[1] * self.conv2rad
-
-        # Now we compute the four terms in the jacobian in turn:
-        # dalpha / dxi
-        denom00 = (np.cos(delta0) - eta*np.sin(delta0)) * \
-            (1.0 + (xi/(np.cos(delta0) - eta*np.sin(delta0) ))**2 )
-        J_ax = 1.0/denom00
-
-        # dalpha / deta
-        denom01 = xi**2 + (np.cos(delta0))**2 \
-            - 2.0 * eta * np.cos(delta0) * np.sin(delta0) \
-            + eta**2 * (np.sin(delta0))**2
-        J_ay = xi*np.sin(delta0) / denom01
-
-        # ddelta / dxi
-        denom10 = (1.0 + xi**2 + eta**2) \
-            * np.sqrt(xi**2 + (np.cos(delta0) - eta * np.sin(delta0) )**2 )
+        # Input angles in radians, and the trig of the tangent point
+        xi, eta, gamma = self._eval_tan2equ_core(x, y)
+        cosd0, sind0 = self.tpointtrig()[2:4]
 
-        J_dx = 0. - xi*( eta*np.cos(delta0) + np.sin(delta0)) / denom10
-
-        # ddelta / deta
-        J_dy = ((1.0 + xi**2)*np.cos(delta0) - eta*np.sin(delta0)) / denom10
-
-        # now set up and populate the jacobian
-        jac = np.zeros(( x.size, 2, 2 ))
-        jac[:,0,0] = J_ax
-        jac[:,0,1] = J_ay
-        jac[:,1,0] = J_dx
-        jac[:,1,1] = J_dy
-        
-        # ... and return this
-        return jac
+        # The four terms are evaluated together. Note that
+        # xi**2 + gamma**2 (which appears in all four) is the
+        # expansion of xi**2 + cos(d0)**2 - 2 eta cos(d0)sin(d0) +
+        # eta**2 sin(d0)**2.
+        return _eval_jac_tan2equ(xi, eta, gamma, cosd0, sind0, out=out, \
+                                 work=self.workbuf(xi, eta))
     
     def tranpos(self):
 
@@ -1691,20 +3077,15 @@ data x"""
             return np.array([]), np.array([])
         
         # Ensure the angles are computed in radians
-        xi = x * self.conv2rad
-        eta = y * self.conv2rad
-        alpha0 = self.pars[0] * self.conv2rad
-        delta0 = self.pars[1] * self.conv2rad
+        xi, eta, gamma = self._eval_tan2equ_core(x, y)
+        alpha0, delta0, cosd0, sind0 = self.tpointtrig()
+
+        alphaf, deltaf = _eval_tan2equ(xi, eta, gamma, alpha0, cosd0, sind0, \
+                                       work=self.workbuf(xi, eta))
 
-        gamma = np.cos(delta0) - eta*np.sin(delta0)
-        alphaf = alpha0 + np.arctan(xi/gamma)
-        deltaf = np.arctan(
-            (eta*np.cos(delta0) + np.sin(delta0) ) /
-            np.sqrt(xi**2 + gamma**2) )
-        
         # Convert the equatorial positions back to the input system.
-        xtran = alphaf / self.conv2rad
-        ytran = deltaf / self.conv2rad
+        xtran = self.fromrad(alphaf, inplace=True)
+        ytran = self.fromrad(deltaf, inplace=True)
 
         return xtran, ytran
         
@@ -1717,7 +3098,30 @@ equatorial, does a little sanity checking on the covariance and jacobian. Update
         #if np.size(self.jac) < 2:
         #    self.setjacobian()
 
-        self.covtran = self.propcov(self.covxy, self.x, self.y)
+        if np.size(self.x) < 1 or np.size(self.y) < 1:
+            self.covtran = np.array([])
+            return
+
+        # Nothing to propagate if the covariances are blank, and zero
+        # covariances (e.g. when fitting the positions only) propagate
+        # to zero, so in neither case do we need the jacobian
+        if np.size(self.covxy) < 1:
+            self.covtran = np.array([])
+            return
+
+        covp = _packedcovs(self.covxy)
+        if covp is None:
+            shp = np.broadcast_shapes(np.shape(self.x), \
+                                      np.shape(self.covxy)[:-2])
+            self.covtran = _zeros22(shp, self.dtype)
+            return
+
+        # As propcov(), but evaluating the jacobian into the
+        # instance scratch buffer
+        self._jacbuf = _reuse22(self._jacbuf, np.shape(self.x), self.dtype)
+        J = self.evaluatejac(self.x, self.y, out=self._jacbuf)
+        self.covtran = _propcov_22(J, covp, \
+                                   work=self._workbuf)
 
     def propcov(self, C=np.array([]), x=np.array([]), y=np.array([]) ):
 
@@ -1728,10 +3132,18 @@ equatorial, returning the transformed covariance matrices as an
         if np.size(self.x) < 1 or np.size(y) < 1:
             return np.array([])
 
+        # Zero covariances (e.g. when fitting the positions only)
+        # propagate to zero, so the jacobian need not be evaluated
+        if np.size(C) < 1:
+            return np.array([])
+
+        if not np.any(C):
+            shp = np.broadcast_shapes(np.shape(x), np.shape(C)[:-2])
+            return _zeros22(shp, np.result_type(C, self.dtype))
+
         J = self.evaluatejac(x, y)
-        Jt = np.transpose(J,axes=(0,2,1))
 
-        return np.matmul(J, np.matmul(C, Jt))
+        return _propcov_22(J, C)
         
     def propagate(self):
 
@@ -1763,26 +3175,25 @@ pointing is changed"""
 
         # Convert the nudge into degrees or radians as appropriate for
         # self.x, self.y
-        conv = 206265.
-        if self.degrees:
-            conv = 3600.
+        conv = self.convarcsec()
 
-        self.x += dxarcsec / conv
-        self.y += dyarcsec / conv
+        # in-place, so that views of the positions held elsewhere
+        # see the nudge
+        np.add(self.x, dxarcsec / conv, out=self.x)
+        np.add(self.y, dyarcsec / conv, out=self.y)
+        self._posgen += 1
 
         # recalculate the jacobian as appropriate for the nudged positions
         self.setjacobian()
 
-    def calcdeltas(self, dxarcsec=10., dyarcsec=10.):
+    def calcdeltas(self, dxarcsec=10., dyarcsec=10., out=None):
 
-        """Estimates deltas in the projected frame from J.dx"""
+        """Estimates deltas in the projected frame from J.dx. If supplied,
+the [N,2] deltas are written into out."""
 
-        conv=206265.
-        if self.degrees:
-            conv = 3600.
+        conv = self.convarcsec()
 
-        dx = np.array([dxarcsec, dyarcsec])/conv
-        dv = np.matmul(self.jac, dx)
+        dv = _mul22vec(self.jac, dxarcsec/conv, dyarcsec/conv, out=out)
 
         return dv
 
@@ -1811,6 +3222,9 @@ Inputs:
 
     Verbose = print screen output
 
+    dtype = floating point type for the positions, jacobian and
+    covariances (as for Tan2equ)
+
     (Arguments kind, checkparsy, xmin, xmax, ymin, ymax, radcec,
     covradec are for compatibility with other calls, and are
     currently ignored)
@@ -1826,11 +3240,17 @@ Inputs:
                  kindpoly=None, \
                  checkparsy=False, \
                  xmin=None, xmax=None, ymin=None, ymax=None, \
-                 radec=None, covradec=None):
+                 radec=None, covradec=None, dtype=np.float64):
+
+        self.dtype = np.dtype(dtype)
+        self.x = np.asarray(x, dtype=self.dtype) # ra
+        self.y = np.asarray(y, dtype=self.dtype) # dec
+        self.covxy = np.asarray(covxy, dtype=self.dtype) # cov ra, dec
 
-        self.x = x # ra
-        self.y = y # dec
-        self.covxy = covxy # cov ra, dec
+        # Counts changes made to the input positions through this
+        # object (new data, nudges), so that objects chaining this one
+        # can tell when their propagated positions are out of date.
+        self._posgen = 0
 
         self.pars=pars # the tangent point
 
@@ -1841,6 +3261,22 @@ Inputs:
         self.conv2rad = 1.
         self.setconversion()
 
+        # Tangent point in radians and the trig of its declination,
+        # and the (pars, conv2rad) they were computed from. Set by
+        # tpointtrig().
+        self._tptrig = ()
+        self._tpkey = None
+
+        # Scratch buffer for the jacobian at the instance positions,
+        # re-used by trancov() while the number of points stays the
+        # same. (covtran itself is handed out to callers, so is
+        # allocated fresh each time.)
+        self._jacbuf = None
+
+        # Scratch space for the intermediates of the projection
+        # kernels, likewise re-used (see _reusework)
+        self._workbuf = None
+
         self.jac = np.eye(2)
         self.initjac()
         self.setjacobian() # set on initialization
@@ -1863,7 +3299,7 @@ Inputs:
 
     def updatedata(self, x=np.array([]), y=np.array([]), \
                    covxy=np.array([]), \
-                   xy=np.array([]) ):
+                   xy=np.array([]), copy=True):
 
         """Ingests supplied data to populate x, y, covars. 
 
@@ -1878,6 +3314,9 @@ Inputs:
 
         xy = [N,2] xy array. If set, supersedes x, y.
 
+        copy = copy the inputs (default). If False, contiguous inputs
+        are used as-is, so the instance shares them with the caller.
+
         
         Outputs:
         None - internal attributes self.x, self.y, self.covxy
@@ -1886,11 +3325,12 @@ Inputs:
 
         # Positions
         if np.ndim(xy) == 2:
-            self.x = xy[:,0]
-            self.y = xy[:,1]
+            self.x = _ingestarray(xy[:,0], copy, self.dtype)
+            self.y = _ingestarray(xy[:,1], copy, self.dtype)
         else:
-            self.x = np.copy(x)
-            self.y = np.copy(y)
+            self.x = _ingestarray(x, copy, self.dtype)
+            self.y = _ingestarray(y, copy, self.dtype)
+        self._posgen += 1
             
         # covariances. We parse here for matching size with the
         # positions before updating
@@ -1903,14 +3343,14 @@ Inputs:
         if ndata != ncov:
             return
 
-        self.covxy = np.copy(covxy)
+        self.covxy = _ingestarray(covxy, copy, self.dtype)
         
     def initxytran(self):
 
         """Initializes convenience-view xytran [N,2] using dimensions of input
         data x"""
 
-        self.xytran = np.zeros(( np.size(self.x), 2 ))
+        self.xytran = np.zeros(( np.size(self.x), 2 ), dtype=self.dtype)
         
     def initjac(self):
 
@@ -1920,10 +3360,10 @@ Inputs:
         if npoints < 1:
             if self.Verbose:
                 print("Equ2tan WARN - no datapoints. Initializing jacobian to identity")
-            self.jac = np.eye(2)
+            self.jac = np.eye(2, dtype=self.dtype)
             return
         
-        self.jac = np.zeros(( npoints, 2, 2 ))
+        self.jac = np.zeros(( npoints, 2, 2 ), dtype=self.dtype)
         self.jac[:,0,0] = 1.
         self.jac[:,1,1] = 1.
         
@@ -1935,16 +3375,50 @@ Inputs:
         if self.degrees:
             self.conv2rad = np.pi/180.
 
+    def convarcsec(self):
+
+        """Returns the number of arcseconds per unit of the instance's
+angles. Read from self.degrees on each call, so that a change to it
+is picked up."""
+
+        if self.degrees:
+            return 3600.
+
+        return 206265.
+
+    def torad(self, x=np.array([]) ):
+
+        """Returns input angles in radians. If the instance already works in
+radians, the input is passed through without the (unit) multiply."""
+
+        if self.conv2rad == 1.:
+            return np.asarray(x)
+
+        return x * self.conv2rad
+
+    def fromrad(self, x=np.array([]), inplace=False):
+
+        """Converts angles in radians back to the instance's convention. If
+inplace, x is overwritten (for arrays that the calling method owns)."""
+
+        if self.conv2rad == 1.:
+            return x
+
+        if inplace:
+            return np.divide(x, self.conv2rad, out=x)
+        
+        return x / self.conv2rad
+
     def updatelimits(self, xmin=None, xmax=None, ymin=None, ymax=None):
 
         """Updates xmin, xmax, etc. attributes"""
 
         # For this object, is used mainly for compatibility
         
-        self.xmin = np.copy(xmin)
-        self.xmax = np.copy(xmax)
-        self.ymin = np.copy(ymin)
-        self.ymax = np.copy(ymax)
+        self.xmin = _copylimit(xmin)
+        self.xmax = _copylimit(xmax)
+        self.ymin = _copylimit(ymin)
+        self.ymax = _copylimit(ymax)
             
     def setjacobian(self):
 
@@ -1952,43 +3426,50 @@ Inputs:
 
         self.jac = self.evaluatejac(self.x, self.y)
         
-    def evaluatejac(self, x=np.array([]), y=np.array([]) ):
+    def tpointtrig(self):
 
-        """Evaluates the jacobian at input x, y points"""
+        """Returns the tangent point (alpha0, delta0) in radians, and
+cos(delta0), sin(delta0). These are recomputed only when the tangent
+point (or the angle convention) changes."""
 
-        if np.size(x) < 1 or np.size(y) < 1:
-            return np.array([])
+        # The tangent point is sometimes set directly by the calling
+        # routine, so we check the values rather than relying on
+        # updatetransf() being called.
+        key = (float(self.pars[0]), float(self.pars[1]), self.conv2rad)
+        if key != self._tpkey:
+            alpha0 = key[0] * self.conv2rad
+            delta0 = key[1] * self.conv2rad
+            self._tptrig = (alpha0, delta0, \
+                            math.cos(delta0), math.sin(delta0))
+            self._tpkey = key
 
-        alpha = x * self.conv2rad
-        delta = y * self.conv2rad
-        alpha0 = self.pars[0] * self.conv2rad
-        delta0 = self.pars[1] * self.conv2rad
+        return self._tptrig
 
-        # We have the same denominator for all four terms
-        denom = ( np.cos(alpha-alpha0) * np.cos(delta) * np.cos(delta0) \
-            + np.sin(delta)*np.sin(delta0) )**2
+    def workbuf(self, alpha=np.array([]), delta=np.array([]) ):
 
-        # dxi/dalpha
-        J_xia = np.cos(delta) * ( np.cos(delta) * np.cos(delta0) \
-            + np.cos(alpha-alpha0) * np.sin(delta)*np.sin(delta0)) / denom
+        """Returns the instance scratch space for the projection kernels at
+alpha, delta (see _reusework), re-allocating it only if their shape or
+type has changed"""
 
-        # dxi/ddelta
-        J_xid = 0. -np.sin(alpha-alpha0) * np.sin(delta0) / denom
+        shp = np.broadcast_shapes(np.shape(alpha), np.shape(delta))
+        dtype = np.result_type(alpha, delta, 1.0)
+        self._workbuf = _reusework(self._workbuf, 6, shp, dtype)
 
-        # deta/dalpha
-        J_etaa = 0.5 * np.sin(alpha-alpha0) * np.sin(2.0*delta) / denom
+        return self._workbuf
 
-        # deta/ddelta
-        J_etad = np.cos(alpha-alpha0) / denom
+    def evaluatejac(self, x=np.array([]), y=np.array([]), out=None):
 
-        # now populate the jacobian
-        jac = np.zeros(( x.size, 2, 2 ))
-        jac[:,0,0] = J_xia
-        jac[:,0,1] = J_xid
-        jac[:,1,0] = J_etaa
-        jac[:,1,1] = J_etad
+        """Evaluates the jacobian at input x, y points"""
+
+        if np.size(x) < 1 or np.size(y) < 1:
+            return np.array([])
 
-        return jac
+        alpha = self.torad(x)
+        delta = self.torad(y)
+        alpha0, delta0, cosd0, sind0 = self.tpointtrig()
+
+        return _eval_jac_equ2tan(alpha, delta, alpha0, cosd0, sind0, \
+                                 out=out, work=self.workbuf(alpha, delta))
         
     def tranpos(self):
 
@@ -2004,23 +3485,17 @@ Inputs:
             return np.array([]), np.array([])
         
         # Ensure the angles are computed in radians
-        alpha = x * self.conv2rad
-        delta = y * self.conv2rad
-        alpha0 = self.pars[0] * self.conv2rad
-        delta0 = self.pars[1] * self.conv2rad
-
-        denom = np.cos(alpha-alpha0) * np.cos(delta)*np.cos(delta0) \
-            + np.sin(delta)*np.sin(delta0)
+        alpha = self.torad(x)
+        delta = self.torad(y)
+        alpha0, delta0, cosd0, sind0 = self.tpointtrig()
 
-        xi = np.cos(delta)*np.sin(alpha-alpha0) / denom
-        
-        eta = (np.cos(delta0)*np.sin(delta) - \
-            np.cos(alpha-alpha0)*np.cos(delta)*np.sin(delta0)) / denom
+        xi, eta = _eval_equ2tan(alpha, delta, alpha0, cosd0, sind0, \
+                                work=self.workbuf(alpha, delta))
 
         # Return tangent plane coordinates including the
         # degrees/radians conversion
-        xtran = xi / self.conv2rad
-        ytran = eta / self.conv2rad
+        xtran = self.fromrad(xi, inplace=True)
+        ytran = self.fromrad(eta, inplace=True)
 
         return xtran, ytran
         
@@ -2035,7 +3510,30 @@ jacobian. Updates self.covtran in the instance.
         if np.size(self.jac) < 2:
             self.setjacobian()
 
-        self.covtran = self.propcov(self.covxy, self.x, self.y)
+        if np.size(self.x) < 1 or np.size(self.y) < 1:
+            self.covtran = np.array([])
+            return
+
+        # Nothing to propagate if the covariances are blank, and zero
+        # covariances (e.g. when fitting the positions only) propagate
+        # to zero, so in neither case do we need the jacobian
+        if np.size(self.covxy) < 1:
+            self.covtran = np.array([])
+            return
+
+        covp = _packedcovs(self.covxy)
+        if covp is None:
+            shp = np.broadcast_shapes(np.shape(self.x), \
+                                      np.shape(self.covxy)[:-2])
+            self.covtran = _zeros22(shp, self.dtype)
+            return
+
+        # As propcov(), but evaluating the jacobian into the
+        # instance scratch buffer
+        self._jacbuf = _reuse22(self._jacbuf, np.shape(self.x), self.dtype)
+        J = self.evaluatejac(self.x, self.y, out=self._jacbuf)
+        self.covtran = _propcov_22(J, covp, \
+                                   work=self._workbuf)
             
     def propcov(self, C=np.array([]), x=np.array([]), y=np.array([]) ):
 
@@ -2044,11 +3542,19 @@ jacobian. Updates self.covtran in the instance.
         if np.size(x) < 1 or np.size(y) < 1:
             return np.array([])
 
+        # Zero covariances (e.g. when fitting the positions only)
+        # propagate to zero, so the jacobian need not be evaluated
+        if np.size(C) < 1:
+            return np.array([])
+
+        if not np.any(C):
+            shp = np.broadcast_shapes(np.shape(x), np.shape(C)[:-2])
+            return _zeros22(shp, np.result_type(C, self.dtype))
+
         # Evaluate the jacobian at the input points
         J = self.evaluatejac(x, y)
-        Jt = np.transpose(J,axes=(0,2,1))
 
-        return np.matmul(J, np.matmul(C, Jt))
+        return _propcov_22(J, C)
 
     def propagate(self):
 
@@ -2078,26 +3584,25 @@ jacobian. Updates self.covtran in the instance.
         """Nudges the raw positions by input dxarcsec, dyarcsec"""
 
         # translate arcsec into the same system as the raw coords
-        conv = 206265.
-        if self.degrees:
-            conv = 3600.
+        conv = self.convarcsec()
 
-        self.x += dxarcsec / conv
-        self.y += dyarcsec / conv
+        # in-place, so that views of the positions held elsewhere
+        # see the nudge
+        np.add(self.x, dxarcsec / conv, out=self.x)
+        np.add(self.y, dyarcsec / conv, out=self.y)
+        self._posgen += 1
 
         # Re-evaluate the jacobian
         self.setjacobian()
 
-    def calcdeltas(self, dxarcsec=10., dyarcsec=10.):
+    def calcdeltas(self, dxarcsec=10., dyarcsec=10., out=None):
 
-        """Calculates transformed deltas using J.dx"""
+        """Calculates transformed deltas using J.dx. If supplied, the [N,2]
+deltas are written into out."""
 
-        conv=206265.
-        if self.degrees:
-            conv = 3600.
+        conv = self.convarcsec()
 
-        dx = np.array([dxarcsec, dyarcsec])/conv
-        dv = np.matmul(self.jac, dx)
+        dv = _mul22vec(self.jac, dxarcsec/conv, dyarcsec/conv, out=out)
 
         return dv
 
@@ -2128,6 +3633,9 @@ Inputs:
 
     xmin, xmax, ymin, ymax = domain limits for the input data on the XY plane
 
+    dtype = floating point type for the positions, jacobians and
+    covariances, passed to both transformation objects
+
     ---
 
     checkparsy = unused, included for compatibility
@@ -2142,10 +3650,14 @@ Inputs:
                  pars=np.array([]), kindpoly='Polynomial', \
                  Verbose=False, \
                  xmin=None, xmax=None, ymin=None, ymax=None, \
-                 checkparsy=None, radec=None, covradec=None):
+                 checkparsy=None, radec=None, covradec=None, \
+                 dtype=np.float64):
 
         # Control variable
         self.Verbose = Verbose
+
+        # Floating point type for the data and propagated quantities
+        self.dtype = np.dtype(dtype)
         
         # Set up the relevant parameters (including inds1d_6term)
         self.initpars()
@@ -2159,18 +3671,29 @@ Inputs:
         
         # Set up the transformation objects
         self.xy2tp = Poly(x, y, covxy, self.parsx, self.parsy, \
-                          kind=kindpoly, checkparsy=False, \
+                          kindpoly=kindpoly, checkparsy=False, \
                           Verbose=self.Verbose, \
-                          xmin=xmin, xmax=xmax, ymin=ymin, ymax=ymax)
+                          xmin=xmin, xmax=xmax, ymin=ymin, ymax=ymax, \
+                          dtype=self.dtype)
 
         # Methods to transform from the tangent plane to equatorial
         self.tp2equ = Tan2equ(pars=self.tangentpoint, \
-                              Verbose=self.Verbose)
+                              Verbose=self.Verbose, dtype=self.dtype)
 
         
         # Initialize a couple of needed things
         self.inittran()
 
+        # Whether the transformed positions need to be (re-)evaluated
+        # before the covariances can be propagated, and the stages'
+        # position counters when they were last evaluated (see
+        # posdirty())
+        self._pos_dirty = True
+        self._posgens = None
+
+        # Copy of the parameters last passed to updatetransf()
+        self._lastpars = None
+
         # Plot labels
         self.labelx = r'$X$'
         self.labely = r'$Y$'
@@ -2222,19 +3745,33 @@ individual transformation objects as it does"""
         self.xtran = self.tp2equ.xtran
         self.ytran = self.tp2equ.ytran
 
+        self._pos_dirty = False
+        self._posgens = self.stagegens()
+
+    def stagegens(self):
+
+        """Returns the position counters of the two transformation
+objects"""
+
+        return (self.xy2tp._posgen, self.tp2equ._posgen)
+
+    def posdirty(self):
+
+        """Returns True if the transformed positions are out of date: the
+parameters have been updated, or either transformation object has had
+new data or a nudge, since tranpos() was last called"""
+
+        return self._pos_dirty or self.stagegens() != self._posgens
+
     def trancov(self):
 
         """Transforms covariances from xy to equ"""
 
-        # To ensure the positions going in to tp2equ.trancov are
-        # correct, we propagate the positions into the tangent plane
-        # as well. This *should* be redundant as long as all the calls
-        # are first to tranpos() and then to trancov(). But that's the
-        # kind of detail I can easily forget, so we sacrifice just a
-        # little speed for safety.
-        self.xy2tp.tranpos()
-        self.tp2equ.x = self.xy2tp.xtran
-        self.tp2equ.y = self.xy2tp.ytran
+        # The positions going in to tp2equ.trancov must be
+        # current. Rather than re-propagating them every time for
+        # safety, we do so only if they are out of date.
+        if self.posdirty():
+            self.tranpos()
         
         self.xy2tp.trancov()
         self.tp2equ.covxy = self.xy2tp.covtran
@@ -2264,11 +3801,22 @@ transformations
         if np.size(pars) < 1:
             return
 
+        # Samplers often change only some of the parameters. If the
+        # polynomial parameters are the same as last time, only the
+        # tangent point needs updating, so we skip re-parsing the
+        # parameters and updating the polynomial.
+        pars = np.asarray(pars)
+        tponly = _tponly(pars, self._lastpars)
+        self._lastpars = np.copy(pars)
+
         # update the parameters...
-        self.updatepars(pars)
+        if tponly:
+            self.tangentpoint = np.copy(pars[0:2])
+        else:
+            self.updatepars(pars)
 
-        parsxy = np.hstack(( self.parsx, self.parsy ))
-        self.xy2tp.updatetransf(parsxy)
+            parsxy = np.hstack(( self.parsx, self.parsy ))
+            self.xy2tp.updatetransf(parsxy)
 
         # ... again, the jacobian for the sky piece depends on
         # coordinates. So we propagate those too.
@@ -2276,6 +3824,10 @@ transformations
         self.tp2equ.x = self.xy2tp.xtran
         self.tp2equ.y = self.xy2tp.ytran
         self.tp2equ.updatetransf(self.tangentpoint)
+
+        # (the tangent plane positions are current, but the
+        # transformed positions are not)
+        self._pos_dirty = True
         
         
     def getlabels(self):
@@ -2325,6 +3877,9 @@ Inputs:
 
     checkparsy = unused, included for compatibility
 
+    dtype = floating point type for the positions, jacobians and
+    covariances, passed to both transformation objects
+
 """
 
     def __init__(self, x=np.array([]), y=np.array([]), covxy=np.array([]), \
@@ -2332,10 +3887,13 @@ Inputs:
                  radec=np.array([]), covradec=np.array([]), \
                  Verbose=False, \
                  xmin=None, xmax=None, ymin=None, ymax=None, \
-                 checkparsy=False):
+                 checkparsy=False, dtype=np.float64):
 
         # control variables
         self.Verbose = Verbose
+
+        # Floating point type for the data and propagated quantities
+        self.dtype = np.dtype(dtype)
         
         # Distribute the parameters for the two transformations
         self.PV = Parvec(pars)
@@ -2343,13 +3901,13 @@ Inputs:
         
         # Set up the transformation objects
         self.xy2tp = Poly(x, y, covxy, self.PV.parsx, self.PV.parsy, \
-                          kind=kindpoly, xmin=xmin, xmax=xmax, \
+                          kindpoly=kindpoly, xmin=xmin, xmax=xmax, \
                           ymin=ymin, ymax=ymax, checkparsy=False, \
-                          Verbose=self.Verbose)
+                          Verbose=self.Verbose, dtype=self.dtype)
 
         self.eq2tp = Equ2tan(radec[:,0], radec[:,1], covradec, \
                              pars=self.PV.tangentpoint, degrees=True, \
-                             Verbose=self.Verbose)
+                             Verbose=self.Verbose, dtype=self.dtype)
         
 
         # Which indices in the output parameter vector correspond to
@@ -2367,6 +3925,16 @@ Inputs:
         self.initxytarg()
         self.covtarg = np.array([])
 
+        # Whether the transformed positions need to be (re-)evaluated
+        # before the covariances can be propagated, and the stages'
+        # position counters when they were last evaluated (see
+        # posdirty())
+        self._pos_dirty = True
+        self._posgens = None
+
+        # Copy of the parameters last passed to updatetransf()
+        self._lastpars = None
+
         # plot labels
         self.labelx = r'$X$'
         self.labely = r'$Y$'
@@ -2381,13 +3949,17 @@ Inputs:
 
         """Initializes xytran to same size as input data"""
 
-        self.xytran = np.zeros(( np.size(self.x), 2 ))
+        # Stored component by component so that tranpos() writes
+        # each column contiguously
+        self.xytran = _empty2((np.size(self.x),), dtype=self.dtype)
+        self.xytran[...] = 0.
 
     def initxytarg(self):
 
         """Initializes xytarg array"""
 
-        self.xytarg = np.zeros(( np.size(self.x), 2 ))
+        self.xytarg = _empty2((np.size(self.x),), dtype=self.dtype)
+        self.xytarg[...] = 0.
 
         
     def updatetransf(self, pars=np.array([]) ):
@@ -2397,14 +3969,26 @@ Inputs:
         if np.size(pars) < 1:
             return
 
+        # As in xy2equ, if only the tangent point has changed since
+        # the last call, the polynomial is left alone.
+        pars = np.asarray(pars)
+        tponly = _tponly(pars, self._lastpars)
+        self._lastpars = np.copy(pars)
+
         # Update the parameters to the two transformation
         # objects. Note that this also updates the jacobians for the
         # uncertainties for each object via the methods in those objects.
-        self.PV.ingestpars(pars)
-        self.polyhasxy0 = self.PV.hasxy0
+        if tponly:
+            self.PV.tangentpoint = np.copy(pars[0:2])
+        else:
+            self.PV.ingestpars(pars)
+            self.polyhasxy0 = self.PV.hasxy0
 
-        self.xy2tp.updatetransf(np.hstack(( self.PV.parsx, self.PV.parsy )) )
+            self.xy2tp.updatetransf(np.hstack(( self.PV.parsx, \
+                                                self.PV.parsy )) )
+            
         self.eq2tp.updatetransf(self.PV.tangentpoint)
+        self._pos_dirty = True
         
     def tranpos(self):
 
@@ -2423,20 +4007,40 @@ Inputs:
         self.ytarg = self.eq2tp.ytran
         
         # Propagated from xy plane...
-        self.xytran[:,0] = self.xtran
-        self.xytran[:,1] = self.ytran
+        np.copyto(self.xytran[:,0], self.xtran)
+        np.copyto(self.xytran[:,1], self.ytran)
 
         # Propagated from the sphere
-        self.xytarg[:,0] = self.xtarg
-        self.xytarg[:,1] = self.ytarg
+        np.copyto(self.xytarg[:,0], self.xtarg)
+        np.copyto(self.xytarg[:,1], self.ytarg)
+
+        self._pos_dirty = False
+        self._posgens = self.stagegens()
+
+    def stagegens(self):
+
+        """Returns the position counters of the two transformation
+objects"""
+
+        return (self.xy2tp._posgen, self.eq2tp._posgen)
+
+    def posdirty(self):
+
+        """Returns True if the transformed positions are out of date (as
+xy2equ.posdirty())"""
+
+        return self._pos_dirty or self.stagegens() != self._posgens
 
     def trancov(self):
 
         """Propagates the covariances from the xy and sphere to the tangent
 plane"""
 
-        # Probably need to be a bit careful when calling this to
-        # ensure that the positions have been propagated first...
+        # The positions must have been propagated first. As in
+        # xy2equ, that is done here only if they are out of date.
+        if self.posdirty():
+            self.tranpos()
+            
         self.xy2tp.trancov()
         self.eq2tp.trancov()
 
@@ -2477,18 +4081,23 @@ class Sky(object):
     
     def __init__(self, possky=np.array([]), covsky=np.array([]), \
                  tpoint=np.array([]), \
-                 postan=np.array([]), covtan=np.array([]) ):
+                 postan=np.array([]), covtan=np.array([]), \
+                 dtype=np.float64):
 
+        # floating point type for the positions, jacobians and
+        # covariances
+        self.dtype = np.dtype(dtype)
+        
         # positions, covariances on the sky
-        self.possky = possky  # Nx2
-        self.covsky = covsky # Nx2x2
+        self.possky = np.asarray(possky, dtype=self.dtype)  # Nx2
+        self.covsky = np.asarray(covsky, dtype=self.dtype) # Nx2x2
 
         # tangent point, degrees
         self.tpoint=tpoint  # [2]
 
         # positions, covariances on the tangent plane
-        self.postan = postan
-        self.covtan = covtan
+        self.postan = np.asarray(postan, dtype=self.dtype)
+        self.covtan = np.asarray(covtan, dtype=self.dtype)
 
         # Jacobians for transforming uncertainties
         self.j2sky = np.array([])    # dalpha/dxi, etc.
@@ -2497,148 +4106,187 @@ class Sky(object):
         # Labels for transformed positions (when plotting)
         self.labelxtran = r'$\alpha$'
         self.labelytran = r'$\delta$'
-        
-    def sky2tan(self):
 
-        """Converts sky coordinates to tangent plane coordinates. Input and output all in DEGREES."""
+        # Tangent point in radians and the trig of its declination,
+        # cached against the tangent point values
+        self._tpkey = None
+        self._tptrig = ()
 
-        # Unpack everything for readability later
-        alpha0 = np.radians(self.tpoint[0])
-        delta0 = np.radians(self.tpoint[1])
+        # Scratch space for the intermediates of the projection
+        # kernels, re-used while the number of points stays the same
+        self._workbuf = None
 
-        alpha = np.radians(self.possky[:,0])
-        delta = np.radians(self.possky[:,1])
+    def tpointtrig(self):
 
-        denom = np.cos(alpha-alpha0) * np.cos(delta)*np.cos(delta0) \
-            + np.sin(delta)*np.sin(delta0)
+        """Returns the tangent point (alpha0, delta0) in radians, and
+cos(delta0), sin(delta0). These are recomputed only when the tangent
+point changes."""
 
-        xi = np.cos(delta)*np.sin(alpha-alpha0) / denom
-        
-        eta = (np.cos(delta0)*np.sin(delta) - \
-            np.cos(alpha-alpha0)*np.cos(delta)*np.sin(delta0)) / denom
+        # self.tpoint is set directly (including by propag2sky and
+        # propag2tan), so we check its values each call.
+        key = (float(self.tpoint[0]), float(self.tpoint[1]))
+        if key != self._tpkey:
+            alpha0 = math.radians(key[0])
+            delta0 = math.radians(key[1])
+            self._tptrig = (alpha0, delta0, \
+                            math.cos(delta0), math.sin(delta0))
+            self._tpkey = key
 
-        self.postan = self.possky*0.
-        self.postan[:,0] = np.degrees(xi)
-        self.postan[:,1] = np.degrees(eta)
+        return self._tptrig
         
-    def tan2sky(self):
+    def workbuf(self, x=np.array([]), y=np.array([]) ):
 
-        """Converts tangent plane to sky coordinates. Input output all in DEGREES."""
+        """Returns the instance scratch space for the projection kernels at
+x, y (see _reusework), re-allocating it only if their shape or type
+has changed"""
 
-        # Again, unpack everything for readability
-        xi  = np.radians(self.postan[:,0])
-        eta = np.radians(self.postan[:,1])
+        shp = np.broadcast_shapes(np.shape(x), np.shape(y))
+        dtype = np.result_type(x, y, 1.0)
+        self._workbuf = _reusework(self._workbuf, 6, shp, dtype)
 
-        alpha0 = np.radians(self.tpoint[0])
-        delta0 = np.radians(self.tpoint[1])
+        return self._workbuf
 
-        gamma = np.cos(delta0) - eta*np.sin(delta0)
-        alphaf = alpha0 + np.arctan(xi/gamma)
-        deltaf = np.arctan(
-            (eta*np.cos(delta0) + np.sin(delta0) ) /
-            np.sqrt(xi**2 + gamma**2) )
+    def radpos(self, pos=np.array([]) ):
 
-        # populate the instance
-        self.possky = self.postan*0.
-        self.possky[:,0] = np.degrees(alphaf)
-        self.possky[:,1] = np.degrees(deltaf)
+        """Returns the two columns of [N,2] positions pos (degrees) in
+radians"""
 
-    def jac2sky(self):
+        return np.radians(pos[:,0]), np.radians(pos[:,1])
 
-        """Populates the Nx2x2 jacobian d(alpha, delta)/d(xi, eta) , which is
-stored in object self.j2sky"""
-        
-        # unpack for readability
-        xi  = np.radians(self.postan[:,0])
-        eta = np.radians(self.postan[:,1])
+    def sky2tan(self, radsky=None):
 
-        alpha0 = np.radians(self.tpoint[0])
-        delta0 = np.radians(self.tpoint[1])
+        """Converts sky coordinates to tangent plane coordinates. Input and output all in DEGREES. (radsky, if supplied, is self.possky already in radians, as from radpos().)"""
 
-        # dalpha / dxi
-        denom00 = (np.cos(delta0) - eta*np.sin(delta0)) * \
-            (1.0 + (xi/(np.cos(delta0) - eta*np.sin(delta0) ))**2 )
-        J_ax = 1.0/denom00
+        # Unpack everything for readability later
+        alpha0, delta0, cosd0, sind0 = self.tpointtrig()
 
-        # dalpha / deta
-        denom01 = xi**2 + (np.cos(delta0))**2 \
-            - 2.0 * eta * np.cos(delta0) * np.sin(delta0) \
-            + eta**2 * (np.sin(delta0))**2
-        J_ay = xi*np.sin(delta0) / denom01
+        if radsky is None:
+            radsky = self.radpos(self.possky)
+        alpha, delta = radsky
 
-        # ddelta / dxi
-        denom10 = (1.0 + xi**2 + eta**2) \
-            * np.sqrt(xi**2 + (np.cos(delta0) - eta * np.sin(delta0) )**2 )
+        # (same kernel as Equ2tan, which evaluates each trig function
+        # once)
+        xi, eta = _eval_equ2tan(alpha, delta, alpha0, cosd0, sind0, \
+                                work=self.workbuf(alpha, delta))
 
-        J_dx = 0. - xi*( eta*np.cos(delta0) + np.sin(delta0)) / denom10
+        # (component by component, as for the jacobians)
+        self.postan = _empty2(np.shape(xi), dtype=xi.dtype)
+        np.degrees(xi, out=self.postan[...,0])
+        np.degrees(eta, out=self.postan[...,1])
+        
+    def tan2sky(self, radtan=None):
 
-        # ddelta / deta
-        J_dy = ((1.0 + xi**2)*np.cos(delta0) - eta*np.sin(delta0)) / denom10
+        """Converts tangent plane to sky coordinates. Input output all in DEGREES. (radtan, if supplied, is self.postan already in radians, as from radpos().)"""
 
-        # Populate the stack
-        self.j2sky = np.zeros(( np.size(J_dx), 2, 2 ))
-        self.j2sky[:,0,0] = J_ax
-        self.j2sky[:,0,1] = J_ay
-        self.j2sky[:,1,0] = J_dx
-        self.j2sky[:,1,1] = J_dy
-        
-    def jac2tan(self):
+        # Again, unpack everything for readability
+        if radtan is None:
+            radtan = self.radpos(self.postan)
+        xi, eta = radtan
 
-        """Populates the Nx2x2 jacobian d(xi,eta)/d(alpha, delta), which is
-stored in object self.j2tan"""
+        alpha0, delta0, cosd0, sind0 = self.tpointtrig()
 
-        # unpack for readability
-        alpha = np.radians(self.possky[:,0])
-        delta = np.radians(self.possky[:,1])
+        # (same kernel as Tan2equ)
+        gamma = cosd0 - eta*sind0
+        alphaf, deltaf = _eval_tan2equ(xi, eta, gamma, alpha0, cosd0, sind0, \
+                                       work=self.workbuf(xi, eta))
 
-        alpha0 = np.radians(self.tpoint[0])
-        delta0 = np.radians(self.tpoint[1])
+        # populate the instance
+        self.possky = _empty2(np.shape(alphaf), dtype=alphaf.dtype)
+        np.degrees(alphaf, out=self.possky[...,0])
+        np.degrees(deltaf, out=self.possky[...,1])
+
+    def jac2sky(self, radtan=None):
+
+        """Populates the Nx2x2 jacobian d(alpha, delta)/d(xi, eta) , which is
+stored in object self.j2sky. (radtan as for tan2sky().)"""
+        
+        # unpack for readability
+        if radtan is None:
+            radtan = self.radpos(self.postan)
+        xi, eta = radtan
 
-        # We have the same denominator for all four terms
-        denom = ( np.cos(alpha-alpha0) * np.cos(delta) * np.cos(delta0) \
-            + np.sin(delta)*np.sin(delta0) )**2
+        alpha0, delta0, cosd0, sind0 = self.tpointtrig()
 
-        # dxi/dalpha
-        J_xia = np.cos(delta) * ( np.cos(delta) * np.cos(delta0) \
-            + np.cos(alpha-alpha0) * np.sin(delta)*np.sin(delta0)) / denom
+        # All four terms share gamma = cos(delta0) - eta sin(delta0)
+        # and xi**2 + gamma**2, which the Tan2equ kernel builds once
+        gamma = cosd0 - eta*sind0
+        self.j2sky = _eval_jac_tan2equ(xi, eta, gamma, cosd0, sind0, \
+                                       work=self.workbuf(xi, eta))
+        
+    def jac2tan(self, radsky=None):
 
-        # dxi/ddelta
-        J_xid = 0. -np.sin(alpha-alpha0) * np.sin(delta0) / denom
+        """Populates the Nx2x2 jacobian d(xi,eta)/d(alpha, delta), which is
+stored in object self.j2tan. (radsky as for sky2tan().)"""
 
-        # deta/dalpha
-        J_etaa = 0.5 * np.sin(alpha-alpha0) * np.sin(2.0*delta) / denom
+        # unpack for readability
+        if radsky is None:
+            radsky = self.radpos(self.possky)
+        alpha, delta = radsky
 
-        # deta/ddelta
-        J_etad = np.cos(alpha-alpha0) / denom
+        alpha0, delta0, cosd0, sind0 = self.tpointtrig()
 
-        # populate the stack
-        self.j2tan = np.zeros(( np.size(J_xia),2,2 ))
-        self.j2tan[:,0,0] = J_xia
-        self.j2tan[:,0,1] = J_xid
-        self.j2tan[:,1,0] = J_etaa
-        self.j2tan[:,1,1] = J_etad
+        # The four terms share one denominator and the trig of the
+        # inputs, each of which the Equ2tan kernel evaluates once
+        # (0.5 sin(2 delta) = sin(delta) cos(delta) in deta/dalpha).
+        self.j2tan = _eval_jac_equ2tan(alpha, delta, alpha0, cosd0, sind0, \
+                                       work=self.workbuf(alpha, delta))
 
     def cov2sky(self):
 
         """Propagates the covariance matrices from tangent plane to sky"""
 
-        J = self.j2sky
-        Jt = np.transpose(J, axes=(0,2,1) )
-        C = self.covtan
+        # Blank or zero covariances need no propagating
+        if np.size(self.covtan) < 1:
+            self.covsky = np.array([])
+            return
 
-        JCJt = np.matmul(J, np.matmul(C, Jt) )
-        self.covsky = JCJt
+        if not np.any(self.covtan):
+            self.covsky = _zeros22(np.shape(self.covtan)[:-2], self.dtype)
+            return
+        
+        # 2x2 congruence written out element by element, as in
+        # Tan2equ.trancov (no [N,2,2] intermediate)
+        self.covsky = _propcov_22(self.j2sky, self.covtan, \
+                                  work=self._workbuf)
 
     def cov2tan(self):
 
         """Propagates the covariance matrices from sky to tangent plane"""
 
-        J = self.j2tan
-        Jt = np.transpose(J, axes=(0,2,1) )
-        C = self.covsky
+        if np.size(self.covsky) < 1:
+            self.covtan = np.array([])
+            return
+
+        if not np.any(self.covsky):
+            self.covtan = _zeros22(np.shape(self.covsky)[:-2], self.dtype)
+            return
+
+        self.covtan = _propcov_22(self.j2tan, self.covsky, \
+                                  work=self._workbuf)
 
-        JCJt = np.matmul(J, np.matmul(C, Jt) )
-        self.covtan = JCJt
+    def cov2taninv(self):
+
+        """Propagates the covariance matrices from sky to tangent plane
+using the inverse of the jacobian to the sky, self.j2sky, rather than
+self.j2tan. (Useful for round-trip checks: this exactly undoes
+cov2sky.)"""
+
+        if np.size(self.covsky) < 1:
+            self.covtan = np.array([])
+            return
+
+        if not np.any(self.covsky):
+            self.covtan = _zeros22(np.shape(self.covsky)[:-2], self.dtype)
+            return
+
+        # J^-1 = adj(J)/det(J), so J^-1 C J^-T = adj(J) C adj(J)^T /
+        # det(J)**2. This way no inverse is formed, and the division
+        # is by one scalar per point.
+        self.covtan = _propcov_22(_adj22(self.j2sky), self.covsky, \
+                                  work=self._workbuf)
+        det2 = _det22(self.j2sky)
+        det2 *= det2
+        self.covtan /= det2[...,np.newaxis,np.newaxis]
 
     def propag2sky(self, alpha0deg, delta0deg, \
                    postan=np.array([]), covtan=np.array([]), \
@@ -2652,16 +4300,20 @@ stored in object self.j2tan"""
         # update the coords and covariances if they were supplied here
         # and if their lengths match
         if np.size(postan) > 0:
-            self.postan = np.copy(postan)
+            self.postan = np.array(postan, dtype=self.dtype)
 
         if np.abs(np.shape(covtan)[0] - np.shape(self.postan)[0]) < 1:
-            self.covtan = np.copy(covtan)
+            # (copied component by component, for the propagation
+            # kernel)
+            self.covtan = _copy22(covtan, self.dtype)
         
-        # Propagate the positions
-        self.tan2sky()
+        # Propagate the positions. The positions in radians are
+        # needed by the jacobian too, so convert them just once.
+        radtan = self.radpos(self.postan)
+        self.tan2sky(radtan)
         
         # Propagate the uncertainties
-        self.jac2sky()
+        self.jac2sky(radtan)
         self.cov2sky()
 
         if retvals:
@@ -2679,16 +4331,18 @@ stored in object self.j2tan"""
         # update the coords and covariances if they were supplied here
         # and if their lengths match
         if np.size(possky) > 0:
-            self.possky = np.copy(possky)
+            self.possky = np.array(possky, dtype=self.dtype)
 
         if np.abs(np.shape(covsky)[0] - np.shape(self.possky)[0]) < 1:
-            self.covsky = np.copy(covsky)
+            self.covsky = _copy22(covsky, self.dtype)
 
-        # Propagate the positions
-        self.sky2tan()
+        # Propagate the positions (converting to radians once, as in
+        # propag2sky)
+        radsky = self.radpos(self.possky)
+        self.sky2tan(radsky)
         
         # Propagate the uncertainties
-        self.jac2tan()
+        self.jac2tan(radsky)
         self.cov2tan()
 
         if retvals:
@@ -2698,23 +4352,24 @@ stored in object self.j2tan"""
 
         """Nudges the tangent plane positions by input offsets"""
 
-        self.postan[:,0] += dxarcsec / 3600.
-        self.postan[:,1] += dyarcsec / 3600.
+        np.add(self.postan[:,0], dxarcsec / 3600., out=self.postan[:,0])
+        np.add(self.postan[:,1], dyarcsec / 3600., out=self.postan[:,1])
 
-    def calcdeltas(self, dxarcsec=10., dyarcsec=10.):
+    def calcdeltas(self, dxarcsec=10., dyarcsec=10., out=None):
 
-        """Estimates deltas on the sky from the jacobian.dxi"""
+        """Estimates deltas on the sky from the jacobian.dxi. If supplied,
+the [N,2] deltas are written into out."""
 
         if np.size(self.j2sky) < 4:
             return
 
         # For this instance the Jacobian expects everything in
         # radians.
-        dxi = np.array([dxarcsec, dyarcsec])/206265.
-        dv = np.matmul(self.j2sky, dxi)
+        dv = _mul22vec(self.j2sky, dxarcsec/206265., dyarcsec/206265., \
+                       out=out)
 
         # Converts back to degrees, since the sky coords are in degrees
-        return np.degrees(dv)
+        return np.degrees(dv, out=dv)
 
     def tranpos(self):
 
@@ -2744,14 +4399,21 @@ def gridxieta(sidelen=2.1, ncoarse=11, nfine=41, llzero=False):
         xv -= np.min(xv)
         yv -= np.min(yv)
         
-    xx, yy = np.meshgrid(xv, yv)
-    xi = np.ravel(xx)
-    eta = np.ravel(yy)
-
-    # if ncoarse and nfine are the same, we do not need to double up
-    if ncoarse != nfine:
-        xi = np.hstack(( xi, np.ravel(yy) ))
-        eta = np.hstack(( eta, np.ravel(xx) ))
+    # The outputs are allocated once at their final size, and each
+    # block filled by broadcasting the 1D vectors (in the same order
+    # as the raveled meshgrid) rather than building full 2D grids and
+    # stacking them. If ncoarse and nfine are the same, we do not
+    # need to double up.
+    shp = (np.size(yv), np.size(xv))
+    nblock = 1 if ncoarse == nfine else 2
+    xi = np.empty(nblock*shp[0]*shp[1], dtype=xv.dtype)
+    eta = np.empty(np.size(xi), dtype=yv.dtype)
+
+    xi.reshape(nblock, *shp)[0] = xv[np.newaxis,:]
+    eta.reshape(nblock, *shp)[0] = yv[:,np.newaxis]
+    if nblock > 1:
+        xi.reshape(nblock, *shp)[1] = yv[:,np.newaxis]
+        eta.reshape(nblock, *shp)[1] = xv[np.newaxis,:]
 
     return xi, eta
 
@@ -2785,8 +4447,8 @@ def makepars(deg=1, reverse=False, scale=1., rotdeg=0.):
     if reverse:
         cdmatrix = np.array([ [parsx[1], parsx[2]], \
                                [parsy[1], parsy[2]] ])
-        cdinv = np.linalg.inv(cdmatrix)
-        detcd = np.linalg.det(cdmatrix)/ (scale * 50.)
+        cdinv, detcd = _inv22(cdmatrix)
+        detcd /= (scale * 50.)
 
         cdinv = np.array([[1.1, -0.03],[0.04, 0.91]])
 
@@ -2831,6 +4493,8 @@ and Stack2x2 objects for full access to results.
 
     """
 
+    from weightedDeltas import NormalEqs, Stack2x2
+    
     NE = NormalEqs(x, y, xi, eta, \
                    fitChoice='6term', xref=0., yref=0., flipx=False, \
                    Verbose=Verbose)
@@ -2871,17 +4535,17 @@ def checkdeltas(transf=None, dxarcsec=10., dyarcsec=10., showPlots=True, \
         transf.ytran = transf.possky[:,1]
         transf.x = transf.postan[:,0]
         transf.y = transf.postan[:,1]
-        detj = np.linalg.det(transf.j2sky)
+        detj = _det22(transf.j2sky)
     else:
-        detj = np.linalg.det(transf.jac)
+        detj = _det22(transf.jac)
         
     dxbrute = nudged.xtran - transf.xtran
     dybrute = nudged.ytran - transf.ytran
-    dvbrute = np.vstack(( dxbrute, dybrute )).T
+    dvbrute = _pack_xy(dxbrute, dybrute)
 
     # Create delta of deltas array
     ddv = dv - dvbrute
-    dmag = np.sqrt(dvbrute[:,0]**2 + dvbrute[:,1]**2)
+    dmag = np.hypot(dvbrute[:,0], dvbrute[:,1])
 
     # views - our figure of merit
     sx = ddv[:,0]/dmag
@@ -2908,6 +4572,8 @@ def checkdeltas(transf=None, dxarcsec=10., dyarcsec=10., showPlots=True, \
         vmaxy = None
         
 
+    plt = _getplt()
+
     fig2=plt.figure(2)
     fig2.clf()
     ax1=fig2.add_subplot(223)
@@ -3000,7 +4666,8 @@ def testTransf(nobjs=5000, alpha0=35., delta0=35., sidelen=2.1, \
                showplots=True, \
                sigx=1.0, sigy=0.7, sigr=0.2, \
                usegrid=True, \
-               dxarcsec=10., dyarcsec=10., showpct=True):
+               dxarcsec=10., dyarcsec=10., showpct=True, \
+               dtype=np.float64):
 
 
     # Example call:
@@ -3015,11 +4682,13 @@ def testTransf(nobjs=5000, alpha0=35., delta0=35., sidelen=2.1, \
 
     if usegrid:
         xi, eta = gridxieta(sidelen, 11, 41)
-        xieta = np.vstack((xi, eta)).T
+        xieta = _pack_xy(xi, eta)
         nobjs = np.size(xi)
         
-    # construct our coordinate object
-    SS = Sky(postan=xieta, tpoint=np.array([alpha0, delta0]) )
+    # construct our coordinate object. (dtype=np.float32 halves the
+    # memory traffic and is plenty for the plots, but the
+    # brute-force deltas then carry float32 roundoff.)
+    SS = Sky(postan=xieta, tpoint=np.array([alpha0, delta0]), dtype=dtype)
 
     # generate some covariances in the tangent plane. For testing,
     # default to uniform so that we can see how the transformation
@@ -3029,8 +4698,10 @@ def testTransf(nobjs=5000, alpha0=35., delta0=35., sidelen=2.1, \
     vcorrel = np.ones(nobjs)*sigr
     CS = CovStack(vstdxi, vstdeta, r12=vcorrel, runOnInit=True)
 
-    # pass the covariances arrays to the uncty2d object
-    SS.covtan = np.copy(CS.covars)
+    # pass the covariances arrays to the uncty2d object. Sky never
+    # modifies covtan in place (the propagations produce new arrays),
+    # so there's no need to copy.
+    SS.covtan = np.asarray(CS.covars, dtype=SS.dtype)
     
     # convert tp to sky
     SS.tan2sky()
@@ -3050,14 +4721,14 @@ def testTransf(nobjs=5000, alpha0=35., delta0=35., sidelen=2.1, \
     ### Check whether the jacobians really are the inverses of each
     ### other...
     Jsky = SS.j2sky
-    Jinv = np.linalg.inv(SS.j2tan)
+    Jinv, det2tan = _inv22(SS.j2tan)
 
     print("Inversion check - sky vs inv(tan):")
     print(Jsky[0])
     print(Jinv[0])
 
     Jtan = SS.j2tan
-    Jsin = np.linalg.inv(SS.j2sky)
+    Jsin, det2sky = _inv22(SS.j2sky)
     
     print("Inversion check - tan vs inv(sky):")
     print(Jtan[0])
@@ -3068,15 +4739,20 @@ def testTransf(nobjs=5000, alpha0=35., delta0=35., sidelen=2.1, \
     print("Covariances on the sky:", SS.covsky.shape)
 
     # Try converting back again... do we get the same as the input?
+    # As a comparison, go back first through the inverse of the same
+    # jacobian that took us to the sky, which exactly undoes cov2sky.
+    SS.cov2taninv()
+    covtaninv = np.copy(SS.covtan)
     SS.cov2tan()
     
     print("INFO: input row 0:", CS.covars[0])
     print("INFO: conv row 0:", SS.covsky[0])
     print("INFO: back row 0:", SS.covtan[0])
+    print("INFO: back (inv sky jacobian) row 0:", covtaninv[0])
 
 
     ### Now try the one-liner
-    TT = Sky()
+    TT = Sky(dtype=dtype)
     TT.propag2sky(alpha0, delta0, xieta, CS.covars)
 
     print("One-liner check:")
@@ -3085,7 +4761,7 @@ def testTransf(nobjs=5000, alpha0=35., delta0=35., sidelen=2.1, \
     print("============")
 
     ### Try the one-liner in the other direction
-    RR = Sky()
+    RR = Sky(dtype=dtype)
     RR.propag2tan(alpha0, delta0, SS.possky, SS.covsky)
 
     print("One-liner check, other direction:")
@@ -3094,9 +4770,8 @@ def testTransf(nobjs=5000, alpha0=35., delta0=35., sidelen=2.1, \
     print("============")
 
     
-    # compute the determinants
-    det2sky = np.linalg.det(SS.j2sky)
-    det2tan = np.linalg.det(SS.j2tan)
+    # (the determinants det2sky, det2tan came with the inverses
+    # above)
 
     # so that we can conveniently divide out the cos(delta) when
     # plotting
@@ -3111,6 +4786,8 @@ def testTransf(nobjs=5000, alpha0=35., delta0=35., sidelen=2.1, \
     if not showplots:
         return
     
+    plt = _getplt()
+
     fig1 = plt.figure(1)
     fig1.clf()
     ax1 = fig1.add_subplot(221)
@@ -3140,7 +4817,8 @@ def testpoly(sidelen=2.1, ncoarse=15, nfine=51, \
              showplots=True, \
              sigx=1.0, sigy=0.7, sigr=0.2, \
              symm=False, cmap='viridis', \
-             dxarcsec=10., dyarcsec=10., degrees=True):
+             dxarcsec=10., dyarcsec=10., degrees=True, \
+             dtype=np.float64):
 
     """Test the propagation through a polynomial"""
 
@@ -3152,7 +4830,7 @@ def testpoly(sidelen=2.1, ncoarse=15, nfine=51, \
     xi, eta = gridxieta(sidelen, ncoarse, nfine)
 
     # concatenate these into the N,2 array we expect
-    xieta = np.vstack((xi, eta)).T
+    xieta = _pack_xy(xi, eta)
     
     # transformation parameters. While testing I'll just write out
     # some examples here. Consider making this more systematic later
@@ -3175,7 +4853,7 @@ def testpoly(sidelen=2.1, ncoarse=15, nfine=51, \
     CS = CovStack(vstdxi, vstdeta, r12=vcorrel, runOnInit=True)
     
     # Create the instance and use it
-    PP = Polynom(xieta, CS.covars, parsx, parsy)
+    PP = Polynom(xieta, CS.covars, parsx, parsy, dtype=dtype)
     PP.propagate()
 
     # try our deltas-checker
@@ -3184,6 +4862,8 @@ def testpoly(sidelen=2.1, ncoarse=15, nfine=51, \
     if not showplots:
         return
     
+    plt = _getplt()
+
     fig1 = plt.figure(1)
     fig1.clf()
     ax1 = fig1.add_subplot(221)
@@ -3267,13 +4947,14 @@ def testpolycoefs(nterms=10, Verbose=True, \
     if not showcheb:
         return
     
-    # Now try playing with numpy's polynomial methods.
-    cheb2d = polynomial.chebyshev.chebval2d(xtest, ytest, PC.p2d) 
+    # Now try the chebyshev evaluation (by Clenshaw's recurrence, as
+    # Poly uses)
+    cheb2d = _chebval2d_fast(xtest, ytest, PC.p2d)
     
     print("INFO - chebval2d at %.2f, %.2f gives %.2f" % (xtest, ytest, cheb2d) )
 
     # Now try the 1D object. Do we trust the domains?
-    cheb1 = polynomial.chebyshev.chebval(xtest, PC.p2d[0])
+    cheb1 = _chebclenshaw(xtest, PC.p2d[0])
 
     C = getattr(polynomial, 'Chebyshev')
 
@@ -3290,13 +4971,14 @@ def testconvenience(sidelen=2.1, ncoarse=15, nfine=51, \
                     showplots=False, \
                     sigx=0.1, sigy=0.07, sigr=0.02, \
                     dxarcsec=10., dyarcsec=10., \
-                    cmap='viridis', showpct=True, reverse=False):
+                    cmap='viridis', showpct=True, reverse=False, \
+                    dtype=np.float64):
 
     """Tests the convenience polynomial methods in numpy."""
 
     # Synthetic datapoints (if reverse, pretend this is a camera)
     xi, eta = gridxieta(sidelen, ncoarse, nfine, llzero=reverse)
-    xieta = np.vstack((xi, eta)).T
+    xieta = _pack_xy(xi, eta)
     nobjs = np.size(xi)
 
     # Synthetic covariances in the original frame
@@ -3322,9 +5004,9 @@ def testconvenience(sidelen=2.1, ncoarse=15, nfine=51, \
     # parameters (but with correct lengths) for initialization so that
     # we can ensure the update step later on works.
     PP = Poly(xi, eta, covsxieta, parsxr, parsyr, \
-              kind=kind, Verbose=Verbose, \
+              kindpoly=kind, Verbose=Verbose, \
               xmin=xmin, xmax=xmax, ymin=ymin, ymax=ymax, \
-              degrees=not(reverse), xisxi=not(reverse))
+              degrees=not(reverse), xisxi=not(reverse), dtype=dtype)
 
     # Try updating the parameters after initialization. Does this
     # work?
@@ -3344,8 +5026,9 @@ def testconvenience(sidelen=2.1, ncoarse=15, nfine=51, \
     etanudged = eta + dyarcsec / conv
 
     PPn = Poly(xinudged, etanudged, covsxieta, parsx, parsy, \
-               kind=kind, Verbose=Verbose, \
-               xmin=PP.xmin, xmax=PP.xmax, ymin=PP.ymin, ymax=PP.ymax)
+               kindpoly=kind, Verbose=Verbose, \
+               xmin=PP.xmin, xmax=PP.xmax, ymin=PP.ymin, ymax=PP.ymax, \
+               dtype=dtype)
     PPn.propagate()
 
     ## ... or we can nudge within the object. Uncomment the lines below
@@ -3362,13 +5045,13 @@ def testconvenience(sidelen=2.1, ncoarse=15, nfine=51, \
 
     dxbrute = PPn.xtran - PP.xtran
     dybrute = PPn.ytran - PP.ytran
-    dvbrute = np.vstack(( dxbrute, dybrute )).T
+    dvbrute = _pack_xy(dxbrute, dybrute)
 
     # create deltas of deltas array
     ddv = dv - dvbrute
-    dmag = np.sqrt(dxbrute**2 + dybrute**2)
+    dmag = np.hypot(dxbrute, dybrute)
 
-    detj = np.linalg.det(PP.jac)
+    detj = _det22(PP.jac)
     
     # views - our figure of merit
     sx = ddv[:,0]/dmag
@@ -3378,6 +5061,8 @@ def testconvenience(sidelen=2.1, ncoarse=15, nfine=51, \
         return
     
     # OK how does that look...
+    plt = _getplt()
+
     fig3=plt.figure(3)
     fig3.clf()
     ax1=fig3.add_subplot(221)
@@ -3450,9 +5135,15 @@ def testsky(sidelen=2.1, ncoarse=15, nfine=51, \
             sigx=0.1, sigy=0.07, sigr=0.02, \
             Verbose=True, \
             dxarcsec=10., dyarcsec=10., cmap='viridis', \
-            deltaback=False, returnwithposan=False):
+            deltaback=False, returnwithposan=False, \
+            xi=np.array([]), eta=np.array([]), dtype=np.float64):
 
-    """Test routines for the one-directional Tan2equ() and Equ2tan(). Example calls:
+    """Test routines for the one-directional Tan2equ() and Equ2tan(). If
+xi, eta are supplied they are used in place of the grid from
+sidelen, ncoarse, nfine (useful when calling repeatedly with the same
+grid). dtype sets the floating point type of the transformation
+objects (np.float32 is plenty for the plots, though the brute-force
+deltas then carry float32 roundoff). Example calls:
 
     # produce a quiver plot showing the impact on (xi, eta) of
     # changing the pointing by dxarcsec, dyarcsec
@@ -3467,7 +5158,8 @@ def testsky(sidelen=2.1, ncoarse=15, nfine=51, \
     # Adapted from testTransf() above.
 
     # create xi, eta positions
-    xi, eta = gridxieta(sidelen, ncoarse, nfine)
+    if np.size(xi) < 1 or np.size(eta) < 1:
+        xi, eta = gridxieta(sidelen, ncoarse, nfine)
 
     # generate some covariances in the tangent plane. For testing,
     # default to uniform so that we can see how the transformation
@@ -3478,67 +5170,52 @@ def testsky(sidelen=2.1, ncoarse=15, nfine=51, \
     tpoint = np.array([alpha0, delta0])
     
     # now set up the tan2sky object, transform positions and covariances
-    T2E = Tan2equ(xi, eta, covs, tpoint, Verbose=Verbose)
+    T2E = Tan2equ(xi, eta, covs, tpoint, Verbose=Verbose, dtype=dtype)
     T2E.propagate()
 
     # Now we create a new object to go in the opposite direction and
     # "undo" the changes.
-    E2T = Equ2tan(T2E.xtran, T2E.ytran, T2E.covtran, tpoint, Verbose=Verbose)
+    E2T = Equ2tan(T2E.xtran, T2E.ytran, T2E.covtran, tpoint, \
+                  Verbose=Verbose, dtype=dtype)
     E2T.propagate()
 
-    # Another useful test: shift positions, transform back to xi, eta,
-    # and find the deltas
-    alpha0nudged = alpha0 + dxarcsec/3600.
-    delta0nudged = delta0 + dyarcsec/3600.
-    E2Tn = Equ2tan(np.copy(T2E.xtran), np.copy(T2E.ytran), T2E.covtran, \
-                   np.array([alpha0nudged, delta0nudged]), Verbose=Verbose)
-    #E2Tn.nudgepos(dxarcsec, dyarcsec)
-    E2Tn.propagate()
-    
     # Create some figures of merit.
     #
     # The determinants of the original covariances and the
     # transformed-back covariances. Not very interesting if the
     # originals are all the same value...
-    detcovxi = np.linalg.det(T2E.covxy)
-    detcovback = np.linalg.det(E2T.covtran)
+    detcovxi = _det22(T2E.covxy)
+    detcovback = _det22(E2T.covtran)
 
     if not returnwithposan:
         print("Round-trip differences in det(cov): %.3e to %.3e" \
               % (np.min(detcovback - detcovxi), \
                  np.max(detcovback - detcovxi)) )
     
-    # Consider refactoring this set of nudge-based diagnostics into
-    # another method, since I'm starting to repeat myself in all these
-    # test routines...
-
-    detj=np.linalg.det(T2E.jac)
-    
-    # Nudge positions, recompute, and recalculate
-    T2En = copy.deepcopy(T2E)
-    T2En.nudgepos(dxarcsec, dyarcsec)
-    T2En.propagate()
-    dxbrute = T2En.xtran - T2E.xtran
-    dybrute = T2En.ytran - T2E.ytran
-    dvbrute = np.vstack((dxbrute, dybrute)).T
-    dmag = np.sqrt(dxbrute**2 + dybrute**2)
-    
-    # compute the deltas with the original points
-    dv = T2E.calcdeltas(dxarcsec, dyarcsec)
-
-    # our figure of merit
-    ddv = dv - dvbrute
-    sx = ddv[:,0]/dmag
-    sy = ddv[:,1]/dmag
-
-    #print(np.min(np.abs(sx)), np.max(np.abs(sx)), np.mean(np.abs(sx)))
-    #print(np.min(dmag), np.max(dmag))
-
+    # Everything below is only needed for the figures, so don't
+    # spend any time on it unless we are plotting.
     if not showplots:
         return
 
+    plt = _getplt()
+
     if deltaback:
 
+        # Another useful test: shift positions, transform back to
+        # xi, eta, and find the deltas
+        alpha0nudged = alpha0 + dxarcsec/3600.
+        delta0nudged = delta0 + dyarcsec/3600.
+        #
+        # Only the positions are used from this one, so it gets no
+        # covariances and just the positions are transformed.
+        # (Equ2tan doesn't modify its inputs, so there's no need to
+        # copy them either.)
+        E2Tn = Equ2tan(T2E.xtran, T2E.ytran, np.array([]), \
+                       np.array([alpha0nudged, delta0nudged]), \
+                       Verbose=Verbose, dtype=dtype)
+        #E2Tn.nudgepos(dxarcsec, dyarcsec)
+        E2Tn.tranpos()
+
         # fit the transformation, returning the fit objects
         NE, SS = fit6term(E2T.xtran, E2T.ytran, E2Tn.xtran, E2Tn.ytran, \
                           Verbose=not(returnwithposan))
@@ -3571,7 +5248,7 @@ def testsky(sidelen=2.1, ncoarse=15, nfine=51, \
         detasho = deltaeta * 3600. + dyarcsec
 
         # arrow magnitudes
-        deltamag = np.sqrt(dxisho**2 + detasho**2)
+        deltamag = np.hypot(dxisho, detasho)
         xrange = np.max(E2T.xtran) - np.min(E2T.xtran)
         quivscale = 0.1*xrange/np.max(deltamag)
 
@@ -3616,7 +5293,7 @@ def testsky(sidelen=2.1, ncoarse=15, nfine=51, \
             converesid *= 1000.
         rxisho = residxi * convresid
         retasho = resideta * convresid
-        residmag = np.sqrt(rxisho**2 + retasho**2)
+        residmag = np.hypot(rxisho, retasho)
         qr = np.quantile(residmag, 0.9)
         
         fig7 = plt.figure(7, figsize=(6,6))
@@ -3665,6 +5342,33 @@ def testsky(sidelen=2.1, ncoarse=15, nfine=51, \
         #### arrow plot finishes here.
         return
         
+    # Consider refactoring this set of nudge-based diagnostics into
+    # another method, since I'm starting to repeat myself in all these
+    # test routines...
+
+    detj = _det22(T2E.jac)
+    
+    # Nudge positions and recompute. Only the positions are needed,
+    # and propxy evaluates them without touching T2E, so there's no
+    # need for a deepcopy (or for propagating its covariances).
+    conv = T2E.convarcsec()
+    xtrann, ytrann = T2E.propxy(T2E.x + dxarcsec/conv, T2E.y + dyarcsec/conv)
+    dxbrute = xtrann - T2E.xtran
+    dybrute = ytrann - T2E.ytran
+    dvbrute = _pack_xy(dxbrute, dybrute)
+    dmag = np.hypot(dxbrute, dybrute)
+    
+    # compute the deltas with the original points
+    dv = T2E.calcdeltas(dxarcsec, dyarcsec)
+
+    # our figure of merit
+    ddv = dv - dvbrute
+    sx = ddv[:,0]/dmag
+    sy = ddv[:,1]/dmag
+
+    #print(np.min(np.abs(sx)), np.max(np.abs(sx)), np.mean(np.abs(sx)))
+    #print(np.min(dmag), np.max(dmag))
+
     # conversion factor for the fractional deltas
     sconv = 1.
     if showpct:
@@ -3752,12 +5456,89 @@ def testsky(sidelen=2.1, ncoarse=15, nfine=51, \
     fig1.subplots_adjust(hspace=0.5, wspace=0.5, top=0.85)
 
 
+def _sky_posang_kernel(xi=np.array([]), eta=np.array([]), \
+                       tpoints=np.array([]), dxarcsec=10., dyarcsec=0.):
+
+    """Pointing-shift core of testsky(deltaback=True), evaluated for M
+tangent points at once. Inputs:
+
+    xi, eta -- [N] tangent plane coordinates (degrees)
+
+    tpoints -- [M,2] tangent points (alpha0, delta0) in degrees
+
+    dxarcsec, dyarcsec -- shift in the tangent point (arcsec)
+
+Returns [M,N] arrays xiback, etaback (the round trip through the sky
+for each tangent point) and xinudged, etanudged (the same sky
+positions projected onto the shifted tangent point), all in degrees."""
+
+    # The projection kernels broadcast, so giving the tangent point
+    # quantities a trailing length-1 axis evaluates every pointing
+    # in one pass rather than building two Tan2equ/Equ2tan objects
+    # per pointing.
+    tp = np.radians(np.atleast_2d(tpoints))
+    alpha0 = tp[:,0:1]
+    delta0 = tp[:,1:2]
+    cosd0 = np.cos(delta0)
+    sind0 = np.sin(delta0)
+
+    xir = np.radians(xi)
+    etar = np.radians(eta)
+    gamma = cosd0 - etar*sind0
+
+    # tangent plane -> sky -> tangent plane
+    alpha, delta = _eval_tan2equ(xir, etar, gamma, alpha0, cosd0, sind0)
+    xiback, etaback = _eval_equ2tan(alpha, delta, alpha0, cosd0, sind0)
+
+    # ... and onto the shifted tangent point
+    alpha0n = alpha0 + np.radians(dxarcsec/3600.)
+    delta0n = delta0 + np.radians(dyarcsec/3600.)
+    xinudged, etanudged = _eval_equ2tan(alpha, delta, alpha0n, \
+                                        np.cos(delta0n), np.sin(delta0n))
+
+    return np.degrees(xiback), np.degrees(etaback), \
+        np.degrees(xinudged), np.degrees(etanudged)
+
+def _rotation_from_affine(x=np.array([]), y=np.array([]), \
+                          xp=np.array([]), yp=np.array([]) ):
+
+    """Fits the 6-term linear model xp = a + b x + c y, yp = d + e x + f
+y by least squares, returning just the rotation angle (degrees) in the
+convention of weightedDeltas.Stack2x2. Inputs are [..., N] arrays; any
+leading axes are separate fits, done together."""
+
+    # The xp and yp fits share the design matrix [1, x, y], so the
+    # 6x6 normal equations are two copies of one 3x3 block: a single
+    # solve with two right-hand sides. Measuring x, y from their
+    # means keeps the block well-conditioned (and changes only the
+    # offsets a, d).
+    dx = x - np.mean(x, axis=-1, keepdims=True)
+    dy = y - np.mean(y, axis=-1, keepdims=True)
+    A = np.stack((np.ones_like(dx), dx, dy), axis=-1)
+    H = np.einsum('...ni,...nj->...ij', A, A)
+    beta = np.einsum('...ni,...nk->...ik', A, np.stack((xp, yp), axis=-1))
+    pars = np.linalg.solve(H, beta)
+
+    b, c = pars[...,1,0], pars[...,2,0]
+    e, f = pars[...,1,1], pars[...,2,1]
+
+    # As Stack2x2.parsFromStack and enforceParsConvention
+    arctancf = np.arctan2(c, f)
+    arctaneb = np.arctan2(e, b)
+    rotdeg = 0.5*np.degrees(arctancf - arctaneb)
+    skewdeg = np.degrees(arctancf + arctaneb)
+    rotdeg = np.where(skewdeg > 90., rotdeg + 90., rotdeg)
+    rotdeg = np.where(skewdeg < -90., rotdeg - 90., rotdeg)
+
+    return rotdeg
+
 def wraptestsky(dxarcsec=10., dyarcsec=0., sidelen=2.1, \
                 ncoarse=51, nfine=51, alpha0=35., \
                 deltamin=-90., deltastep=5.):
 
     """Wrapper to testsky - repeats the process for given dxarcsec,
-dyarcsec, returning the rotation angle from the pointing test. Example call:
+dyarcsec, returning the rotation angle from the pointing test. Example
+call:
 
     unctytwod.wraptestsky(deltastep=5.)
 
@@ -3765,19 +5546,23 @@ dyarcsec, returning the rotation angle from the pointing test. Example call:
 
     # set up declination values
     deltas = np.arange(deltamin, 90.+deltastep, deltastep)
-    thetas = np.zeros(deltas.size)
 
-    for idelt in range(len(deltas)):
-        thetas[idelt] = testsky(sidelen=sidelen, \
-                                dxarcsec=dxarcsec, dyarcsec=dyarcsec, \
-                                deltaback=True, \
-                                returnwithposan=True, \
-                                ncoarse=ncoarse, nfine=nfine, \
-                                delta0=deltas[idelt])
+    # All the pointings go through the projections together, and
+    # then through the 6-term fits together. Only the rotation is
+    # wanted, so we skip the full fit6term machinery.
+    xi, eta = gridxieta(sidelen, ncoarse, nfine)
+    tpoints = np.column_stack((np.full_like(deltas, alpha0), deltas))
+    xiback, etaback, xinudged, etanudged = \
+        _sky_posang_kernel(xi, eta, tpoints, dxarcsec, dyarcsec)
+
+    thetas = _rotation_from_affine(xiback, etaback, \
+                                   xinudged, etanudged) * 3600.
 
     est = dxarcsec * np.sin(np.radians(deltas))
         
     # quick plot
+    plt = _getplt()
+
     fig8 = plt.figure(8, figsize=(5,3))
     fig8.clf()
     ax8 = fig8.add_subplot(111)
@@ -3802,9 +5587,10 @@ dyarcsec, returning the rotation angle from the pointing test. Example call:
 
 def testpattern(deg=2, kind='Polynomial', sidelen=1., ncoarse=41, \
                 showbases=True, listpars=False, cmap='viridis', \
-                norescale=False):
+                norescale=False, dtype=np.float64):
 
-    """Test the psttern matrix construction. Example call:
+    """Test the psttern matrix construction (with the pattern in type
+dtype). Example call:
 
     unctytwod.testpattern(2, kind='Polynomial', ncoarse=41, showbases=True)
 
@@ -3816,7 +5602,8 @@ def testpattern(deg=2, kind='Polynomial', sidelen=1., ncoarse=41, \
     # For timing
     t0 = time.time()
     
-    PM = Patternmatrix(deg, x, y, kind=kind, norescale=norescale)
+    PM = Patternmatrix(deg, x, y, kind=kind, norescale=norescale, \
+                       dtype=dtype)
 
     # Now check that our convention matches what we expect by applying
     # this to a randomly generated parameter set
@@ -3827,28 +5614,24 @@ def testpattern(deg=2, kind='Polynomial', sidelen=1., ncoarse=41, \
     W[:,0,0] = 1.
     W[:,1,1] = 1.
 
-    # lhs
-    WE = np.matmul(W, epsilon[:,:,np.newaxis]).squeeze()
-
-    # Now for the transposed pattern matrix multiplied by this
-    PT = np.transpose(PM.pattern, axes=(0,2,1) )
-    lhs = np.matmul(PT, WE[:,:,np.newaxis]).squeeze()
-
-    print("LHS shape:", lhs.shape)
+    # Normal equations: beta = sum_k P_k^T W_k eps_k and Hess =
+    # sum_k P_k^T W_k P_k. Contracting over the points inside einsum
+    # avoids forming the [N, M] and [N, M, M] per-point terms only
+    # to sum them.
+    ops = (PM.pattern, W, epsilon)
+    beta = np.einsum('kji,kjl,kl->i', *ops, \
+                     optimize=_einsumpath('kji,kjl,kl->i', *ops))
 
-    # now for the right hand side
-    WP = np.matmul(W, PM.pattern)
-    rhs = np.matmul(PT, WP)
+    ops = (PM.pattern, W, PM.pattern)
+    Hess = np.einsum('kji,kjl,klm->im', *ops, \
+                     optimize=_einsumpath('kji,kjl,klm->im', *ops))
 
-    print("RHS shape:", rhs.shape)
+    print("LHS shape:", beta.shape)
+    print("RHS shape:", Hess.shape)
 
-    # now use the normal eqs
-    beta = np.sum(lhs, axis=0)
-    Hess = np.sum(rhs, axis=0)
-
-    Hinv = np.linalg.inv(Hess)
-    
-    parsrecov = np.matmul(Hinv, beta)
+    # Solve rather than invert: we only need Hess^-1 beta, not the
+    # inverse itself
+    parsrecov = np.linalg.solve(Hess, beta)
 
     t1 = time.time()
     print("Time elapsed constructing and solving: %.2e sec" % (t1-t0))
@@ -3867,6 +5650,8 @@ def testpattern(deg=2, kind='Polynomial', sidelen=1., ncoarse=41, \
 
         # add a panel showing the transformed positions
         ilast = (PM.deg+1)**2
+        plt = _getplt()
+
         thisfig = plt.figure(PM.fignum)
         ax = thisfig.add_subplot(PM.deg+1, PM.deg+1, ilast)
         dum = ax.scatter(epsilon[:,0], epsilon[:,1], s=1)